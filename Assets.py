@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Assets Module
+"""
+# pylint: disable=C0103
+import json as _json
+import os as _os
+import base64 as _base64
+import hashlib as _hashlib
+import io as _io
+import mimetypes as _mimetypes
+import threading as _threading
+from collections import namedtuple as _namedtuple
+from pathlib import Path as _Path
+from random import choice as _choice
+from types import MappingProxyType as _MappingProxyType
+from Ziesha.Core import _Singleton
+
+ROOT = _Path(__file__).resolve().parent
+ASSET_DIR = ROOT / 'images'
+CACHE_DIR = _Path('~/.cache/ziesha-pool/assets').expanduser()
+GIF_BUDGET = 512 * 1024  # bytes
+SIDEBAR_WIDTH = 320  # pixels
+MIN_WIDTH = 256  # pixels
+MAX_FRAME_STEP = 8  # keep at least every 8th frame
+SIDEBAR_IMAGE = ASSET_DIR / 'sidebar.png'
+
+Asset = _namedtuple('Asset', 'path mime size sha256 b64')
+
+
+def _load(file, name):
+    """Read a file into an Asset."""
+    data = file.read_bytes()
+    mime = _mimetypes.guess_type(file.name)[0] or 'application/octet-stream'
+    return Asset(name, mime, len(data), _hashlib.sha256(data).hexdigest(),
+                 _base64.b64encode(data).decode())
+
+
+class AssetBundle(metaclass=_Singleton):
+    """
+    Read-only bundle of encoded assets shared by all sessions.
+
+    Files under `images/` are indexed once per process and read and base64
+    encoded on first use. Only the encoded copy is kept. Sidebar GIFs are
+    left out, `SidebarImages` serves them from files.
+
+    Args:
+        root (str, Path): Asset directory.
+        exclude (tuple): Directories under `root` which are not bundled.
+    """
+
+    def __init__(self, root=ASSET_DIR, exclude=('gifs',)):
+        root = _Path(root)
+        self._lock = _threading.Lock()
+        self._colorized = {}
+        self._assets = {}
+        self._files = _MappingProxyType({
+            self._name(f): f for f in sorted(root.rglob('*'))
+            if f.is_file() and not any(
+                p.startswith('.') or p in exclude
+                for p in f.relative_to(root).parts)})
+
+    def __repr__(self):
+        return f"AssetBundle({len(self._assets)}/{len(self._files)} " + \
+               "assets loaded)"
+
+    def __contains__(self, path):
+        return self._name(path) in self._files
+
+    def __iter__(self):
+        return iter(self._files)
+
+    @staticmethod
+    def _name(path):
+        """Get bundle name of a path relative to the project root."""
+        path = _Path(path)
+        if not path.is_absolute():
+            path = ROOT / path
+        path = path.resolve()
+        try:
+            return path.relative_to(ROOT).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    @property
+    def size(self):
+        """Get total size of the bundle in bytes."""
+        return sum(self.get(k).size for k in self._files)
+
+    @property
+    def manifest(self):
+        """Get sizes, hashes and types of the assets."""
+        return {k: {'size': a.size, 'sha256': a.sha256, 'mime': a.mime}
+                for k, a in ((k, self.get(k)) for k in self._files)}
+
+    def get(self, path):
+        """
+        Get an asset.
+
+        Args:
+            path (str): Asset path, e.g. 'images/favico.png'.
+        Returns:
+            Asset: Asset.
+        Raises:
+            KeyError: If path is not in the bundle.
+        """
+        name = self._name(path)
+        asset = self._assets.get(name)
+        if asset is None:
+            asset = _load(self._files[name], name)
+            with self._lock:
+                asset = self._assets.setdefault(name, asset)
+        return asset
+
+    def b64(self, path):
+        """Get base64 encoded content of an asset."""
+        return self.get(path).b64
+
+    def colorized(self, path, hue=20):
+        """
+        Get base64 encoded PNG of a colorized asset.
+
+        Args:
+            path (str): Asset path.
+            hue (float): Hue within 0-360.
+        Returns:
+            str: Base64 encoded PNG.
+        """
+        key = (self._name(path), hue)
+        if key not in self._colorized:
+            from Colorize import colorize_bytes  # pylint: disable=C0415
+            data = _base64.b64decode(self.get(key[0]).b64)
+            b64 = _base64.b64encode(colorize_bytes(data, hue)).decode()
+            with self._lock:
+                self._colorized.setdefault(key, b64)
+        return self._colorized[key]
+
+
+def _digest(file):
+    """Get sha256 of a file."""
+    return _hashlib.sha256(_Path(file).read_bytes()).hexdigest()
+
+
+def _save(path, save):
+    """Write a cache file atomically with a `save(tmp_path)` callback."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{_os.getpid()}.tmp')
+    save(tmp)
+    _os.replace(tmp, path)
+    return path
+
+
+def thumbnail(file, cache_dir=CACHE_DIR):
+    """
+    Get a static PNG of the first frame of an image.
+
+    Args:
+        file (str, Path): Image file.
+        cache_dir (str, Path): Cache directory.
+    Returns:
+        Path: PNG file.
+    """
+    from PIL import Image  # pylint: disable=C0415
+    path = _Path(cache_dir) / f"{_digest(file)}-thumb.png"
+    if not path.exists():
+        with Image.open(file) as im:
+            im.seek(0)
+            frame = im.convert('RGBA')
+        _save(path, lambda tmp: frame.save(tmp, format='PNG', optimize=True))
+    return path
+
+
+def _resize(frames, scale):
+    """Resize frames by a scale factor."""
+    size = tuple(max(int(i * scale), 1) for i in frames[0].size)
+    if size == frames[0].size:
+        return frames
+    return [f.resize(size) for f in frames]
+
+
+def _encode_webp(frames, durations, step, quality):
+    """Encode every `step`th frame as an animated WebP."""
+    kept = frames[::step]
+    durations = [sum(durations[i:i + step])
+                 for i in range(0, len(durations), step)]
+    buf = _io.BytesIO()
+    kept[0].save(buf, format='WEBP', save_all=True, append_images=kept[1:],
+                 duration=durations, loop=0, quality=quality, method=4)
+    return buf.getvalue()
+
+
+def transcode_gif(file, budget=GIF_BUDGET, width=SIDEBAR_WIDTH,
+                  cache_dir=CACHE_DIR, min_width=MIN_WIDTH):
+    """
+    Transcode a GIF to an animated WebP within a byte budget.
+
+    The animation is scaled down to `width`. While it does not fit the
+    budget, frames are dropped (keeping the total duration), then quality
+    is lowered and only then size is lowered down to `min_width`. If
+    nothing fits, the smallest result is used.
+
+    Args:
+        file (str, Path): GIF file.
+        budget (int): Maximum size in bytes.
+        width (int): Maximum width in pixels.
+        cache_dir (str, Path): Cache directory.
+        min_width (int): Minimum width in pixels.
+    Returns:
+        Path: WebP file.
+    """
+    from PIL import ImageSequence, Image  # pylint: disable=C0415
+    path = _Path(cache_dir) / \
+        f"{_digest(file)}-{budget}-{width}-{min_width}.webp"
+    if path.exists():
+        return path
+    with Image.open(file) as im:
+        durations = [f.info.get('duration', im.info.get('duration', 100))
+                     for f in ImageSequence.Iterator(im)]
+        frames = [f.convert('RGBA') for f in ImageSequence.Iterator(im)]
+    w = frames[0].size[0]
+    scale = min(width / w, 1)
+    min_scale = min(min_width / w, scale)
+    frames = _resize(frames, scale)
+    step, quality = 1, 75
+    best = data = _encode_webp(frames, durations, step, quality)
+    while len(data) > budget:
+        if step < MAX_FRAME_STEP:
+            # Size is roughly linear in the number of frames.
+            step = min(max(step + 1, -(-step * len(data) // budget)),
+                       MAX_FRAME_STEP)
+        elif quality > 30:
+            quality = 30
+        elif scale > min_scale:
+            new = max(scale * 0.9 * (budget / len(data)) ** 0.5, min_scale)
+            frames, scale = _resize(frames, new / scale), new
+        else:
+            break
+        data = _encode_webp(frames, durations, step, quality)
+        best = data if len(data) < len(best) else best
+    return _save(path, lambda tmp: tmp.write_bytes(best))
+
+
+class SidebarImages(metaclass=_Singleton):
+    """
+    Sidebar animations transcoded to WebP within a byte budget.
+
+    The GIF list is read once. GIFs are transcoded in a background thread
+    and a static thumbnail is served until a transcode is ready. Encoded
+    animations are kept per file, so they are sent unchanged as data URIs.
+
+    Args:
+        pattern (str): Glob pattern of GIFs under the project root.
+        budget (int): Maximum size of a transcoded animation in bytes.
+        width (int): Maximum width of a transcoded animation in pixels.
+    """
+
+    def __init__(self, pattern='images/gifs/*.gif', budget=GIF_BUDGET,
+                 width=SIDEBAR_WIDTH):
+        self._gifs = tuple(sorted(ROOT.glob(pattern)))
+        self._budget = budget
+        self._width = width
+        self._ready = {}
+        self._thumbs = {}
+        self._uris = {}
+        _threading.Thread(target=self._transcode, name='sidebar-transcode',
+                          daemon=True).start()
+
+    def __repr__(self):
+        return f"SidebarImages({len(self._ready)}/{len(self._gifs)} ready)"
+
+    @property
+    def gifs(self):
+        """Get GIF files."""
+        return self._gifs
+
+    def _transcode(self):
+        """Transcode all GIFs."""
+        for gif in self._gifs:
+            try:
+                self._ready[gif] = transcode_gif(gif, self._budget,
+                                                 self._width)
+            except (OSError, ValueError):
+                continue
+
+    def get(self, gif):
+        """
+        Get file to show for a GIF.
+
+        Args:
+            gif (Path): GIF file.
+        Returns:
+            Path: Transcoded animation, thumbnail or the GIF itself.
+        """
+        if gif in self._ready:
+            return self._ready[gif]
+        if gif not in self._thumbs:
+            try:
+                self._thumbs[gif] = thumbnail(gif)
+            except (OSError, ValueError):
+                self._thumbs[gif] = gif
+        return self._thumbs[gif]
+
+    def choice(self):
+        """Get a random GIF. None if there are no GIFs."""
+        return _choice(self._gifs) if len(self._gifs) > 0 else None
+
+    def random(self):
+        """Get file of a random sidebar image."""
+        gif = self.choice()
+        return SIDEBAR_IMAGE if gif is None else self.get(gif)
+
+    def data_uri(self, file):
+        """
+        Get data URI of an image file, encoded once per file.
+
+        Args:
+            file (Path): Image file, e.g. a transcoded animation.
+        Returns:
+            str: Data URI with the unchanged file content.
+        """
+        uri = self._uris.get(file)
+        if uri is None:
+            asset = _load(_Path(file), _Path(file).name)
+            uri = self._uris.setdefault(
+                file, f"data:{asset.mime};base64,{asset.b64}")
+        return uri
+
+
+if __name__ == '__main__':
+    print(_json.dumps(AssetBundle().manifest, indent=4))
@@ -1,30 +1,144 @@
 import io
+import os
 import base64
+import hashlib
+from pathlib import Path
 from PIL import Image
 import numpy as np
-import colorsys
 
-rgb_to_hsv = np.vectorize(colorsys.rgb_to_hsv)
-hsv_to_rgb = np.vectorize(colorsys.hsv_to_rgb)
+CACHE_DIR = Path('~/.cache/ziesha-pool/colorize').expanduser()
+
+
+def rgb_to_hsv(rgb):
+    """
+    Convert RGB to HSV on whole arrays.
+
+    Same as `colorsys.rgb_to_hsv` for every pixel. V has the scale of the
+    input, H and S are in [0, 1].
+
+    Args:
+        rgb (ndarray): Array of shape (..., 3).
+    Returns:
+        ndarray: Float array of shape (..., 3).
+    """
+    rgb = np.asarray(rgb, dtype=np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = rgb.max(axis=-1)
+    delta = maxc - rgb.min(axis=-1)
+    hsv = np.zeros(rgb.shape, dtype=np.float32)
+    nz = delta > 0
+    d = np.where(nz, delta, 1)
+    rc, gc, bc = (maxc - r) / d, (maxc - g) / d, (maxc - b) / d
+    h = np.where(r == maxc, bc - gc,
+                 np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    hsv[..., 0] = np.where(nz, (h / 6.0) % 1.0, 0)
+    hsv[..., 1] = np.where(nz, delta / np.where(maxc > 0, maxc, 1), 0)
+    hsv[..., 2] = maxc
+    return hsv
+
+
+def hsv_to_rgb(hsv, out=None):
+    """
+    Convert HSV to RGB on whole arrays.
+
+    Same as `colorsys.hsv_to_rgb` for every pixel.
+
+    Args:
+        hsv (ndarray): Array of shape (..., 3).
+        out (ndarray): Array of shape (..., 3) to write the result to.
+    Returns:
+        ndarray: RGB array.
+    """
+    hsv = np.asarray(hsv, dtype=np.float32)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    i = i.astype(np.int8) % 6
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    if out is None:
+        out = np.empty(hsv.shape, dtype=np.float32)
+    out[..., 0] = np.choose(i, (v, q, p, p, t, v))
+    out[..., 1] = np.choose(i, (t, v, v, q, p, p))
+    out[..., 2] = np.choose(i, (p, p, t, v, v, q))
+    return out
+
 
 def img_to_btye_array(image: Image) -> bytes:
     imgByteArr = io.BytesIO()
     image.save(imgByteArr, format='png')
     return imgByteArr.getvalue()
 
-def img_to_bytes(img_path):
-    img = colorize(Image.open(img_path), 20)
-    img_bytes = img_to_btye_array(img)
-    encoded = base64.b64encode(img_bytes).decode()
-    return encoded
 
-def shift_hue(arr, hout):
-    r, g, b, a = np.rollaxis(arr, axis=-1)
-    h, s, v = rgb_to_hsv(r, g, b)
-    h = hout
-    r, g, b = hsv_to_rgb(h, s, v)
-    arr = np.dstack((r, g, b, a))
-    return arr
+def colorize_bytes(data, hue=20):
+    """
+    Get PNG bytes of a colorized image.
+
+    Results are cached on disk by (image hash, hue), so every asset is
+    colorized once.
+
+    Args:
+        data (bytes): Image file content.
+        hue (float): Hue within 0-360.
+    Returns:
+        bytes: PNG bytes.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    cached = CACHE_DIR / f"{digest}-{hue:g}.png"
+    if cached.exists():
+        return cached.read_bytes()
+    img_bytes = img_to_btye_array(colorize(Image.open(io.BytesIO(data)), hue))
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_bytes(img_bytes)
+        os.replace(tmp, cached)
+    except OSError:
+        pass
+    return img_bytes
+
+
+def colorize_file(img_path, hue=20):
+    """
+    Get PNG bytes of a colorized image file.
+
+    Args:
+        img_path (str): Image file.
+        hue (float): Hue within 0-360.
+    Returns:
+        bytes: PNG bytes.
+    """
+    return colorize_bytes(Path(img_path).read_bytes(), hue)
+
+
+def img_to_bytes(img_path, hue=20):
+    return base64.b64encode(colorize_file(img_path, hue)).decode()
+
+
+def shift_hue(arr, hout, inplace=False):
+    """
+    Set hue of RGBA pixels.
+
+    Args:
+        arr (ndarray): Array of shape (..., 4), e.g. an image (H, W, 4)
+            or a batch of images (N, H, W, 4).
+        hout (float): Hue within 0-1.
+        inplace (bool): Write the result to `arr`. Works on uint8 and
+            float32 arrays.
+    Returns:
+        ndarray: Array with the new hue.
+    """
+    hsv = rgb_to_hsv(arr[..., :3])
+    hsv[..., 0] = hout
+    if inplace:
+        rgb = hsv_to_rgb(hsv, out=hsv)
+        arr[..., :3] = rgb
+        return arr
+    out = np.array(arr, dtype=np.float32)
+    hsv_to_rgb(hsv, out=out[..., :3])
+    return out
+
 
 def colorize(image, hue):
     """
@@ -32,7 +146,7 @@ def colorize(image, hue):
     `hue` (hue within 0-360); returns another PIL image.
     """
     img = image.convert('RGBA')
-    arr = np.array(np.asarray(img).astype('float'))
-    new_img = Image.fromarray(shift_hue(arr, hue/360.).astype('uint8'), 'RGBA')
+    arr = np.array(img)
+    new_img = Image.fromarray(shift_hue(arr, hue/360., inplace=True), 'RGBA')
 
     return new_img
@@ -8,25 +8,23 @@ Ziesha mining pool
 # wallet = "0xa5875f8e8a4121097630c9ecab1475ded4a45a6ec98402a57c592f68910648c4"
 
 from streamlit.components.v1 import html
-from os import path
+from os import path, environ
 from pathlib import Path
-import glob
-from random import randrange
-from PIL import Image, ImageEnhance
+from time import monotonic
 
 import streamlit as st  # pylint: disable=E0401
-import streamlit.components.v1 as components
 # https://discuss.streamlit.io/t/streamlit-option-menu-is-a-simple-streamlit-component-that-allows-users-to-select-a-single-item-from-a-list-of-options-in-a-menu/20514
 from streamlit_option_menu import option_menu  # pylint: disable=E0401
 
-import Miners as miners
-from Ziesha.Server import MPNWallet
+from Ziesha.Imports import lazy, report as import_report
+from Ziesha import Metrics as metrics
+from Ziesha import Trace as trace
+# Heavy modules are imported when the page needing them is rendered.
+miners = lazy('Miners')
+server = lazy('Ziesha.Server')
+footer = lazy('footer')
+assets = lazy('Assets')
 # from Faucet import send_zsh
-from footer import header, footer, footer_content, header_content
-from Colorize import colorize, img_to_bytes
-from Ziesha.Server import Faucet
-# from streamlit import javascript
-from streamlit_javascript import st_javascript
 
 POOL_NAME = "ApriPool"
 POOL_CLOSED = False
@@ -35,15 +33,53 @@ FAUCET_CLOSED = False
 # POOL_WALLET_ADDRESS = "0xac798dca2e3275b06948c6839b9813697fc2fb60174c79e366f860d844b17202"
 POOL_WALLET_ADDRESS = "z24a4a451aa41c593903f550078720d0985be2cb453d2a445927298d2e21c74778"
 FAUCET_AMOUNT=1
+TICKET_WAIT_SEC = 60  # seconds
 
 def set_sidebar():
-    sidebar_img = 'images/sidebar.png'
-    gifs = glob.glob("images/gifs/*.gif")
-    if len(gifs) > 0:
-        sidebar_img = gifs[randrange(len(gifs))]
-    if path.exists(sidebar_img):
-        st.sidebar.image(sidebar_img, use_column_width=True)
+    images = assets.SidebarImages()
+    # Chosen once per session, so reruns do not switch images.
+    if 'sidebar_gif' not in st.session_state:
+        st.session_state['sidebar_gif'] = images.choice()
+    gif = st.session_state['sidebar_gif']
+    sidebar_img = assets.SIDEBAR_IMAGE if gif is None else images.get(gif)
+    if not path.exists(sidebar_img):
+        return
+    if sidebar_img.suffix == '.webp':
+        # st.image re-encodes animations to a single still frame.
+        st.sidebar.markdown(
+            f'<img src="{images.data_uri(sidebar_img)}" style="width: 100%">',
+            unsafe_allow_html=True)
+    else:
+        st.sidebar.image(str(sidebar_img), use_column_width=True)
+
+def show_faucet_ticket():
+    """
+    Show status of the last faucet request of the session.
 
+    The status is updated in place until the request is finished or
+    `TICKET_WAIT_SEC` passed, without rerunning the page.
+    """
+    ticket_id = st.session_state.get('faucet_ticket')
+    if ticket_id is None:
+        return
+    ticket = server.Faucet(POOL_WALLET_ADDRESS).ticket(ticket_id)
+    if ticket is None:
+        del st.session_state['faucet_ticket']
+        return
+    status = st.empty()
+    deadline = monotonic() + TICKET_WAIT_SEC
+    while not ticket.done and monotonic() < deadline:
+        status.info(f"Your request is {ticket.status}...")
+        ticket.wait(1)
+    if ticket.status == 'sent':
+        status.success(ticket.message)
+    elif ticket.status == 'failed':
+        status.error(ticket.message)
+    else:
+        status.info(f"Your request is still {ticket.status}. "
+                    "Reload the page to see its result.")
+
+@trace.traced
 def set_header_and_footer():
     """Set header and footer."""
     st.markdown("""
@@ -54,14 +90,15 @@ def set_header_and_footer():
     """, unsafe_allow_html=True)
     my_js = f"""
         window.addEventListener('load', function () {{
-            var x = '{footer_content()}';
+            var x = '{footer.footer_content()}';
             window.parent.document.getElementsByTagName('footer')[0].innerHTML = x;
-            var x = '{header_content()}';
+            var x = '{footer.header_content()}';
             window.parent.document.getElementsByTagName('header')[0].innerHTML = x;
         }})
     """.replace('\n', '')
     html(f"<script>{my_js}</script>", height=0)
 
+@trace.traced
 def main():
     """Entry point."""
 
@@ -77,7 +114,8 @@ def main():
     if WEBSITE_CLOSED:
         st.markdown(Path('markdown/pool_maintainance.md').read_text())
         st.markdown("<img src='data:image/png;base64,{}' class='img-fluid'>".format(
-            img_to_bytes("images/maintenance.png")), unsafe_allow_html=True)
+            assets.AssetBundle().colorized("images/maintenance.png", 20)),
+            unsafe_allow_html=True)
         exit()
 
     menu = ["Home"]
@@ -122,7 +160,7 @@ def main():
 
         if submitted:
             try:
-                token = miners.register(MPNWallet(wallet))
+                token = miners.register(server.MPNWallet(wallet))
                 st.success(f"{miners.get_uzi_miner_command(token)}")
             except Exception as e:
                 st.error(e)
@@ -138,12 +176,15 @@ def main():
 
         if submitted:
             try:
-                result = Faucet(POOL_WALLET_ADDRESS).send(
+                ticket = server.Faucet(POOL_WALLET_ADDRESS).submit(
                     wallet, FAUCET_AMOUNT)
                 # result = send_zsh(wallet, POOL_WALLET_ADDRESS, FAUCET_AMOUNT)
-                st.success(result)
+                st.session_state['faucet_ticket'] = ticket.id
             except Exception as e:
+                st.session_state.pop('faucet_ticket', None)
                 st.error(e)
+
+        show_faucet_ticket()
     else:
         st.subheader(choice)
 
@@ -166,5 +207,9 @@ if __name__ == '__main__':
             'About': about
         },
     )
-    set_header_and_footer() 
-    main()
+    metrics.serve()
+    with trace.trace('rerun'):
+        set_header_and_footer()
+        main()
+    if environ.get('ZIESHA_IMPORT_REPORT'):
+        print(import_report())
@@ -6,92 +6,381 @@ Miners Module
 """
 # pylint: disable=C0103
 import json as _json
+import os as _os
+import threading as _threading
+from collections import deque as _deque
+from time import sleep as _sleep
+from time import monotonic as _monotonic
 import requests as _req
 from requests import get as _get
+from requests.adapters import HTTPAdapter as _HTTPAdapter
+from urllib3.exceptions import NewConnectionError as _NewConnectionError
+from Ziesha.Core import validate_keys as _validate_keys
+from Ziesha.Exceptions import PoolError
+from Ziesha.Exceptions import PoolConnectionError
+from Ziesha.Exceptions import PoolTimeoutError
+from Ziesha.Exceptions import PoolHTTPError
+from Ziesha import Metrics as _metrics
 
 PORT = 8766
-IP = _get('https://api.ipify.org').content.decode('utf8')
+URL = 'http://127.0.0.1'
+CONNECT_TIMEOUT = 3.05  # seconds
+READ_TIMEOUT = 10  # seconds
+RETRIES = 2
+BACKOFF = 0.2  # seconds
+MINERS_TTL = 10  # seconds
+IP_URL = 'https://api.ipify.org'
+_ip = None
 
+_pool_seconds = _metrics.histogram(
+    'ziesha_pool_request_seconds', 'Latency of uzi-pool API calls.',
+    ('endpoint',))
+_pool_total = _metrics.counter(
+    'ziesha_pool_requests_total', 'uzi-pool API calls by outcome.',
+    ('endpoint', 'outcome'))
+
+
+def get_ip():
+    """
+    Get public IP of the pool.
+
+    The IP is resolved on first use and cached. `POOL_PUBLIC_IP`
+    environment variable overrides it.
+    """
+    global _ip  # pylint: disable=W0603
+    if _ip is None:
+        _ip = _os.environ.get('POOL_PUBLIC_IP') or \
+            _get(IP_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+                 ).content.decode('utf8')
+    return _ip
+
+
+def __getattr__(name):
+    """Resolve module level `IP` lazily."""
+    if name == 'IP':
+        return get_ip()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def _not_sent(err):
+    """Check if a failed request never reached uzi-pool."""
+    reason = getattr(err.args[0], 'reason', None) if err.args else None
+    return isinstance(err, _req.ConnectTimeout) or \
+        isinstance(reason, _NewConnectionError)
+
+
+class PoolClient:
+    """
+    Keep-alive HTTP client of the uzi-pool API.
+
+    Args:
+        url (str): Base url of uzi-pool.
+        port (int): Port of uzi-pool.
+        connect_timeout (float): Connect timeout in seconds.
+        read_timeout (float): Read timeout in seconds.
+        retries (int): Number of retries after a failed attempt.
+        backoff (float): First backoff in seconds, doubled on every retry.
+        pool_size (int): Number of connections kept alive.
+    """
 
-def _request(post, where,
-             url='http://127.0.0.1', port='8766'):
-    """Send message to uzi-pool."""
     header = {"scheme": "http",
               "accept": "*/*",
               "Content-Type": "application/json"}
-    try:
-        # print(f'Trying to send message:\n{post}')
-        url = f"{url}:{port}/{where}"
-        req = _req.post(url=url, data=str(post), headers=header)
-        data = req.content
-        if req.status_code == 200:
-            # print(datetime.now())
-            # pprint.pprint(data)
-            # print('success', req.status_code)
-            return data
-        print('ERROR:', req.status_code)
-        return 'err'
-    except (_req.RequestException, Exception) as connect_err:
-        print(connect_err)
-        return 'err'
+
+    def __init__(self, url=URL, port=PORT, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, retries=RETRIES, backoff=BACKOFF,
+                 pool_size=10):
+        self.url = f"{url}:{port}"
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self._session = _req.Session()
+        self._session.headers.update(self.header)
+        self._session.mount('http://', _HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=0))
+        self._latency = _deque(maxlen=1000)
+        self._lock = _threading.Lock()
+
+    def __repr__(self):
+        return f"PoolClient({self.url})"
+
+    @property
+    def latency(self):
+        """Get latest calls as (where, seconds, ok) tuples."""
+        with self._lock:
+            return list(self._latency)
+
+    def _record(self, where, start, outcome):
+        """Record latency and outcome of a call."""
+        seconds = _monotonic() - start
+        with self._lock:
+            self._latency.append((where, seconds, outcome == 'ok'))
+        _pool_seconds.observe(seconds, endpoint=where)
+        _pool_total.inc(endpoint=where, outcome=outcome)
+
+    def post(self, where, data='', idempotent=True):
+        """
+        Send message to uzi-pool.
+
+        Failed attempts are retried with exponential backoff. Requests which
+        are not idempotent are retried only if they never reached uzi-pool.
+
+        Args:
+            where (str): API endpoint.
+            data (str): Request body.
+            idempotent (bool): True if request is safe to repeat.
+        Returns:
+            bytes: Response body.
+        Raises:
+            PoolConnectionError: If uzi-pool cannot be reached.
+            PoolTimeoutError: If uzi-pool does not answer in time.
+            PoolHTTPError: If uzi-pool answers with an error status.
+            PoolError: If request fails for another reason.
+        """
+        url = f"{self.url}/{where}"
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                _sleep(self.backoff * 2 ** (attempt - 1))
+            start = _monotonic()
+            try:
+                res = self._session.post(url=url, data=str(data),
+                                         timeout=self.timeout)
+            except (_req.ConnectionError, _req.Timeout) as e:
+                if isinstance(e, _req.Timeout) and not \
+                        isinstance(e, _req.ConnectTimeout):
+                    self._record(where, start, 'timeout')
+                    err = PoolTimeoutError(f"uzi-pool timed out: {e}")
+                else:
+                    self._record(where, start, 'connection')
+                    err = PoolConnectionError(f"Cannot reach uzi-pool: {e}")
+                if idempotent or _not_sent(e):
+                    continue
+                raise err from e
+            except _req.RequestException as e:
+                self._record(where, start, 'error')
+                raise PoolError(str(e)) from e
+            self._record(where, start, 'ok' if res.status_code == 200
+                         else 'http')
+            if res.status_code == 200:
+                return res.content
+            err = PoolHTTPError(res.status_code)
+            if not (idempotent and res.status_code >= 500):
+                raise err
+        raise err
+
+
+_client = None
+_client_lock = _threading.Lock()
+
+
+def client():
+    """Get shared uzi-pool client."""
+    global _client  # pylint: disable=W0603
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PoolClient()
+    return _client
+
+
+def configure(url=URL, port=PORT, **kwargs):
+    """
+    Use another uzi-pool, e.g. a local stand-in.
+
+    The shared client is replaced and the miner index is dropped.
+
+    Args:
+        url (str): Base url of uzi-pool.
+        port (int): Port of uzi-pool.
+        **kwargs: Other PoolClient arguments.
+    Returns:
+        PoolClient: New shared client.
+    """
+    global _client  # pylint: disable=W0603
+    with _client_lock:
+        _client = PoolClient(url, port, **kwargs)
+    _index.invalidate()
+    return _client
+
+
+def _request(post, where, idempotent=True):
+    """Send message to uzi-pool."""
+    return client().post(where, post, idempotent)
 
 
 def get_uzi_miner_command(token):
     """Get uzi-miner command."""
-    return f"uzi-miner --pool --node {IP}:{PORT} " + \
+    return f"uzi-miner --pool --node {get_ip()}:{PORT} " + \
            f"--miner-token \"{token}\" --threads $(nproc --all)"
 
 
+class MinerIndex:
+    """
+    Cached token <-> wallet index of miners registered to uzi-pool.
+
+    Args:
+        ttl (float): Lifetime of the index in seconds.
+    """
+
+    def __init__(self, ttl=MINERS_TTL):
+        self.ttl = ttl
+        self._tokens = {}
+        self._wallets = {}
+        self._loaded_at = None
+        self._lock = _threading.Lock()
+
+    def __repr__(self):
+        return str(self.miners)
+
+    def _load(self):
+        """Fetch miner list if the index is expired."""
+        t = self._loaded_at
+        if t is not None and _monotonic() - t < self.ttl:
+            return
+        with self._lock:
+            t = self._loaded_at
+            if t is not None and _monotonic() - t < self.ttl:
+                return
+            tokens = _json.loads(_request("", 'get-miners'))
+            wallets = {}
+            for token, wallet in tokens.items():
+                wallets.setdefault(wallet, token)
+            self._tokens, self._wallets = tokens, wallets
+            self._loaded_at = _monotonic()
+
+    def invalidate(self):
+        """Drop the index so the next lookup fetches the miner list."""
+        self._loaded_at = None
+
+    def add(self, token, wallet):
+        """
+        Add a registered miner to the index.
+
+        Args:
+            token (str): Miner token.
+            wallet (str): Wallet address.
+        """
+        with self._lock:
+            self._tokens = {**self._tokens, token: wallet}
+            self._wallets = {wallet: token, **self._wallets}
+
+    @property
+    def size(self):
+        """Get number of indexed miners without fetching. None if not loaded."""
+        return None if self._loaded_at is None else len(self._tokens)
+
+    @property
+    def miners(self):
+        """Get wallets by token."""
+        self._load()
+        return dict(self._tokens)
+
+    @property
+    def wallets(self):
+        """Get tokens by wallet."""
+        self._load()
+        return self._wallets
+
+    def token(self, wallet):
+        """
+        Get token by wallet address.
+
+        Raises:
+            ValueError: If wallet is not registered.
+        """
+        try:
+            return self.wallets[wallet]
+        except KeyError as e:
+            raise ValueError(f"'{wallet}' is not registered") from e
+
+    def wallet(self, token):
+        """Get wallet address by token."""
+        self._load()
+        return self._tokens[token]
+
+
+_index = MinerIndex()
+_metrics.gauge('ziesha_pool_miners', 'Miners registered to uzi-pool.',
+               collect=lambda: {(): _index.size})
+
+
 def get():
     """Get Miner list."""
-    return _json.loads(_request("", 'get-miners'))
+    return _index.miners
 
 
 def get_token(wallet):
     """Get token by wallet address."""
-    d = get()
-    tokens = list(d.keys())
-    address = list(d.values())
-    return tokens[address.index(wallet)]
+    return _index.token(wallet)
 
 
 def get_wallet_by_token(token):
     """Get Miner list."""
-    return get()[token]
+    return _index.wallet(token)
 
 
 def get_wallets():
     """Get list of wallets joined to the pool."""
-    return list(set(get().values()))
+    return list(_index.wallets)
 
 
 def is_registered(wallet):
     """Check wallet is registered or not."""
-    return str(wallet) in get_wallets()
+    return str(wallet) in _index.wallets
 
 
 def number():
     """Get number of miners registered to the pool."""
-    return len(get_wallets())
+    return len(_index.wallets)
 
 
 def register(wallet):
     """Add/register Miner to the pool."""
-    if is_registered(str(wallet)):
-        return get_token(str(wallet))
-    result = _request(f"{{\"mpn_addr\":\"{str(wallet)}\"}}", 'add-miner')
-    if result == 'err':
+    wallet = str(wallet)
+    if is_registered(wallet):
+        return get_token(wallet)
+    try:
+        result = _request(f"{{\"mpn_addr\":\"{wallet}\"}}", 'add-miner',
+                          idempotent=False)
+    except PoolError as e:
         raise ValueError(
-            "Error in registering miner. Check your wallet address.")
-    return _json.loads(result)['miner_token']
+            "Error in registering miner. Check your wallet address.") from e
+    token = _json.loads(result)['miner_token']
+    _index.add(token, wallet)
+    return token
+
+
+_WALLET_ERRORS = {'empty': "Wallet address cannot be empty",
+                  'prefix': "You should enter a MPN Address",
+                  'invalid': "Enter a valid Ziesha MPN wallet address"}
+
+
+def _wallet_error(wallet, err):
+    """Map key error to a wallet validation message."""
+    if err == '':
+        return ''
+    if wallet == "":
+        return _WALLET_ERRORS['empty']
+    if isinstance(wallet, str) and not wallet.lower().startswith('z'):
+        return _WALLET_ERRORS['prefix']
+    return _WALLET_ERRORS['invalid']
+
+
+def validate_wallets(wallets):
+    """
+    Validate many Ziesha wallet addresses at once.
+
+    Args:
+        wallets (list): Wallet addresses.
+    Returns:
+        list: Error message of every wallet. Empty string if valid.
+    """
+    wallets = list(wallets)
+    errors = _validate_keys([w.lower() if isinstance(w, str) else w
+                             for w in wallets], 'z')
+    return [_wallet_error(w, e) for w, e in zip(wallets, errors)]
 
 
 def validate_wallet(wallet):
     """Validate a Ziesha wallet address."""
-    if wallet == "":
-        return "Wallet address cannot be empty"
-    if 0 in [w in "0123456789abcdefz" for w in wallet.lower()]:
-        return "Enter a valid Ziesha MPN wallet address"
-    if not 'z' in wallet:
-        return "You should enter a MPN Address"
-    return ""
+    return validate_wallets([wallet])[0]
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Badge module
+
+Local rendering of shields.io style status badges.
+"""
+# pylint: disable=C0103
+
+from base64 import b64encode as _b64encode
+from functools import lru_cache as _lru_cache
+from html import escape as _escape
+
+COLORS = {'brightgreen': '#4c1', 'green': '#97ca00', 'yellowgreen': '#a4a61d',
+          'yellow': '#dfb317', 'orange': '#fe7d37', 'red': '#e05d44',
+          'blue': '#007ec6', 'grey': '#555', 'gray': '#555',
+          'lightgrey': '#9f9f9f', 'lightgray': '#9f9f9f'}
+
+# Approximate advance widths of Verdana 11px.
+_WIDTHS = {' ': 3.9, '!': 4.6, '"': 5.8, '(': 5.4, ')': 5.4, ',': 4.0,
+           '-': 4.6, '.': 4.0, '/': 5.4, ':': 5.0, ';': 5.0, 'I': 4.6,
+           'J': 5.0, 'M': 9.4, 'W': 10.9, 'f': 3.9, 'i': 3.1, 'j': 3.4,
+           'l': 3.1, 'm': 10.7, 'r': 4.7, 't': 4.3, 'w': 9.0, '|': 5.0}
+_DEFAULT_WIDTH = {True: 7.5, False: 6.8}
+
+_TEMPLATE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="20" '
+    'role="img" aria-label="{title}"><title>{title}</title>'
+    '<linearGradient id="s" x2="0" y2="100%">'
+    '<stop offset="0" stop-color="#bbb" stop-opacity=".1"/>'
+    '<stop offset="1" stop-opacity=".1"/></linearGradient>'
+    '<clipPath id="r"><rect width="{w}" height="20" rx="3" fill="#fff"/>'
+    '</clipPath><g clip-path="url(#r)">'
+    '<rect width="{lw}" height="20" fill="#555"/>'
+    '<rect x="{lw}" width="{mw}" height="20" fill="{color}"/>'
+    '<rect width="{w}" height="20" fill="url(#s)"/></g>'
+    '<g fill="#fff" text-anchor="middle" '
+    'font-family="Verdana,Geneva,DejaVu Sans,sans-serif" '
+    'text-rendering="geometricPrecision" font-size="110">'
+    '<text aria-hidden="true" x="{lx}" y="150" fill="#010101" '
+    'fill-opacity=".3" transform="scale(.1)" textLength="{ll}">{label}</text>'
+    '<text x="{lx}" y="140" transform="scale(.1)" fill="#fff" '
+    'textLength="{ll}">{label}</text>'
+    '<text aria-hidden="true" x="{mx}" y="150" fill="#010101" '
+    'fill-opacity=".3" transform="scale(.1)" textLength="{ml}">{message}</text>'
+    '<text x="{mx}" y="140" transform="scale(.1)" fill="#fff" '
+    'textLength="{ml}">{message}</text></g></svg>')
+
+
+def _text_width(text):
+    """Get approximate width of a text in pixels."""
+    return sum(_WIDTHS.get(c, _DEFAULT_WIDTH[c.isupper()]) for c in text)
+
+
+def _color(color):
+    """Get hex value of a named or hex color."""
+    color = str(color).lower()
+    if color in COLORS:
+        return COLORS[color]
+    if all(c in '0123456789abcdef' for c in color.lstrip('#')):
+        return '#' + color.lstrip('#')
+    return COLORS['lightgrey']
+
+
+@_lru_cache(maxsize=256)
+def svg(label, message, color):
+    """
+    Render a flat badge.
+
+    Args:
+        label (str): Left text.
+        message (str): Right text.
+        color (str): Named (e.g. 'green') or hex color of the right side.
+    Returns:
+        str: SVG document.
+    """
+    label, message = str(label), str(message)
+    ll, ml = round(_text_width(label) * 10), round(_text_width(message) * 10)
+    lw, mw = ll // 10 + 10, ml // 10 + 10
+    return _TEMPLATE.format(
+        w=lw + mw, lw=lw, mw=mw, color=_color(color),
+        lx=lw * 5, mx=lw * 10 + mw * 5, ll=ll, ml=ml,
+        label=_escape(label), message=_escape(message),
+        title=_escape(f"{label}: {message}"))
+
+
+@_lru_cache(maxsize=256)
+def data_uri(label, message, color):
+    """
+    Render a flat badge as a data URI for `<img src>`.
+
+    Args:
+        label (str): Left text.
+        message (str): Right text.
+        color (str): Named (e.g. 'green') or hex color of the right side.
+    Returns:
+        str: `data:image/svg+xml;base64,...` URI.
+    """
+    return 'data:image/svg+xml;base64,' + \
+        _b64encode(svg(label, message, color).encode()).decode()
@@ -6,15 +6,185 @@ Core module
 """
 # pylint: disable=C0103
 
+import re as _re
+import shlex as _shlex
 import subprocess as _subp
+import threading as _threading
+from functools import lru_cache as _lru_cache
+from os.path import basename as _basename
+from time import monotonic as _monotonic
 from abc import abstractmethod as _abstractmethod
 from .Exceptions import KeyError as _KeyError
 from .Exceptions import InvalidKeyError as _InvalidKeyError
+from . import Metrics as _metrics
+from . import Trace as _trace
 
-def run_cmd(*cmd):
+CMD_TIMEOUT = 30  # seconds
+CMD_MAX_CONCURRENCY = 4  # children per tool
+
+_cmd_seconds = _metrics.histogram(
+    'ziesha_command_seconds', 'Wall time of tool commands.',
+    ('tool', 'subcommand'))
+_cmd_total = _metrics.counter(
+    'ziesha_commands_total', 'Tool commands by outcome.',
+    ('tool', 'subcommand', 'outcome'))
+
+
+class CommandResult:
+    """
+    Result of a command run by the command engine.
+
+    Args:
+        args (list): Executed argv.
+        returncode (int): Exit code. None if the command did not finish.
+        stdout (str): Decoded and stripped standard output.
+        stderr (str): Decoded and stripped standard error.
+        duration (float): Wall time in seconds, including queueing.
+        timed_out (bool): True if the command hit its timeout.
+    """
+
+    def __init__(self, args, returncode, stdout='', stderr='',
+                 duration=0.0, timed_out=False):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.timed_out = timed_out
+
+    def __repr__(self):
+        return f"CommandResult(args={self.args!r}, " + \
+               f"returncode={self.returncode}, " + \
+               f"duration={self.duration:.3f}s, timed_out={self.timed_out})"
+
+    @property
+    def ok(self):
+        """Check if command finished with exit code 0."""
+        return self.returncode == 0
+
+
+class _CommandEngine:
+    """Run commands without a shell, bounded per tool."""
+
+    def __init__(self, timeout=CMD_TIMEOUT, max_concurrency=CMD_MAX_CONCURRENCY):
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self._lock = _threading.Lock()
+        self._slots = {}
+
+    def _slot(self, tool):
+        """Get concurrency slot of the tool."""
+        with self._lock:
+            if tool not in self._slots:
+                self._slots[tool] = _threading.BoundedSemaphore(
+                    self.max_concurrency)
+            return self._slots[tool]
+
+    @staticmethod
+    def _argv(cmd):
+        """
+        Build argv from command arguments.
+
+        A single argument is split like a shell would do, so callers
+        passing a whole command line keep working.
+        """
+        cmd = [str(c) for c in cmd]
+        if len(cmd) == 1:
+            cmd = _shlex.split(cmd[0])
+        return [c for c in cmd if c != '']
+
+    @staticmethod
+    def _subcommand(argv):
+        """Get subcommand of an argv, i.e. leading words before options."""
+        words = []
+        for a in argv[1:3]:
+            if not _re.fullmatch(r'[a-z][a-z_-]*', a):
+                break
+            words.append(a)
+        return ' '.join(words)
+
+    def run(self, *cmd, timeout=None):
+        """
+        Run a command and record its duration and outcome.
+
+        Args:
+            *cmd (str): Command and its arguments.
+            timeout (float): Timeout in seconds.
+        Returns:
+            CommandResult: Result of the command.
+        """
+        with _trace.span('run', cmd=' '.join(str(c) for c in cmd)):
+            res = self._run(*cmd, timeout=timeout)
+        if len(res.args) > 0:
+            tool = _basename(res.args[0])
+            sub = self._subcommand(res.args)
+            outcome = 'ok' if res.ok else \
+                'timeout' if res.timed_out else 'error'
+            _cmd_seconds.observe(res.duration, tool=tool, subcommand=sub)
+            _cmd_total.inc(tool=tool, subcommand=sub, outcome=outcome)
+        return res
+
+    def _run(self, *cmd, timeout=None):
+        """
+        Run a command.
+
+        Args:
+            *cmd (str): Command and its arguments.
+            timeout (float): Timeout in seconds. Covers waiting for a free
+                slot and running the command.
+        Returns:
+            CommandResult: Result of the command.
+        """
+        argv = self._argv(cmd)
+        timeout = self.timeout if timeout is None else timeout
+        start = _monotonic()
+        if len(argv) == 0:
+            return CommandResult(argv, None, stderr='Empty command')
+        slot = self._slot(_basename(argv[0]))
+        if not slot.acquire(timeout=timeout):
+            return CommandResult(argv, None, stderr='No free slot',
+                                 duration=_monotonic() - start,
+                                 timed_out=True)
+        try:
+            left = max(timeout - (_monotonic() - start), 0.001)
+            out = _subp.run(argv, stdout=_subp.PIPE, stderr=_subp.PIPE,
+                            stdin=_subp.DEVNULL, timeout=left, check=False)
+            return CommandResult(
+                argv, out.returncode,
+                out.stdout.strip().decode("utf-8", "replace"),
+                out.stderr.strip().decode("utf-8", "replace"),
+                _monotonic() - start)
+        except _subp.TimeoutExpired:
+            return CommandResult(argv, None, stderr='Timed out',
+                                 duration=_monotonic() - start,
+                                 timed_out=True)
+        except OSError as e:
+            return CommandResult(argv, None, stderr=str(e),
+                                 duration=_monotonic() - start)
+        finally:
+            slot.release()
+
+
+_engine = _CommandEngine()
+
+
+def run(*cmd, timeout=None):
+    """
+    Run command and return its result.
+
+    Args:
+        *cmd (str): Command and its arguments.
+        timeout (float): Timeout in seconds.
+    Returns:
+        CommandResult: Exit code, output, stderr and duration.
+    """
+    return _engine.run(*cmd, timeout=timeout)
+
+
+@_trace.traced
+def run_cmd(*cmd, timeout=None):
     """Run commands in terminal."""
-    with _subp.Popen(' '.join(cmd), stdout=_subp.PIPE, shell=True) as out:
-        return out.communicate()[0].strip().decode("utf-8")
+    return run(*cmd, timeout=timeout).stdout
 
 
 class _Singleton(type):
@@ -27,6 +197,81 @@ class _Singleton(type):
         return cls._instances[cls]
 
 
+class _Multiton(type):
+    """Metaclass keeping one instance per value of the first argument."""
+
+    _instances = {}
+
+    def __call__(cls, key, *args, **kwargs):
+        k = (cls, str(key))
+        if k not in cls._instances:
+            cls._instances[k] = super(_Multiton, cls).__call__(key, *args,
+                                                               **kwargs)
+        return cls._instances[k]
+
+
+_HEX = '0123456789abcdef'
+
+
+def _prefixes(startswith=None):
+    """Get prefixes as a tuple."""
+    if startswith is None:
+        return ('z', '0x')
+    if isinstance(startswith, str):
+        return (startswith,)
+    return tuple(startswith)
+
+
+@_lru_cache(maxsize=32)
+def _patterns(startswith):
+    """Get compiled (prefix, full) patterns of a prefix tuple."""
+    chars = _HEX + ''.join(sw[-1] for sw in startswith)
+    prefix = '|'.join(_re.escape(sw) for sw in startswith)
+    return _re.compile(prefix), \
+        _re.compile(f"(?:{prefix})[{_re.escape(chars)}]*")
+
+
+def check_key(key, startswith=None):
+    """
+    Check a key/wallet address.
+
+    Args:
+        key (str): Key or Wallet address.
+        startswith (str, list): String or list of strings that the key must
+            start with. Default is ['z', '0x'].
+    Returns:
+        Exception: Error of the key. None if key is valid.
+    """
+    if not isinstance(key, str):
+        return TypeError("Address/Key must be a string.")
+    if key == "":
+        return ValueError("Address/Key cannot be empty.")
+    startswith = _prefixes(startswith)
+    prefix, full = _patterns(startswith)
+    if full.fullmatch(key):
+        return None
+    if not prefix.match(key):
+        return _KeyError(startswith=list(startswith))
+    return _InvalidKeyError('Enter a valid Ziesha public key/address.')
+
+
+def validate_keys(keys, startswith=None):
+    """
+    Validate many keys/wallet addresses at once.
+
+    Args:
+        keys (iterable): Keys or Wallet addresses.
+        startswith (str, list): String or list of strings that the keys must
+            start with. Default is ['z', '0x'].
+    Returns:
+        list: Error message of every key. Empty string if key is valid.
+    """
+    startswith = _prefixes(startswith)
+    match = _patterns(startswith)[1].fullmatch
+    return ['' if isinstance(k, str) and match(k)
+            else str(check_key(k, startswith)) for k in keys]
+
+
 class Key(str):
     """
     Key/Wallet class.
@@ -51,22 +296,9 @@ class Key(str):
         """Create a new Key/Wallet class."""
         if isinstance(key, cls):
             return key
-        if not isinstance(key, str):
-            raise TypeError("Address/Key must be a string.")
-        if key == "":
-            raise ValueError("Address/Key cannot be empty.")
-        if startswith is None:
-            startswith = ['z', '0x']
-        if isinstance(startswith, str):
-            startswith = [startswith]
-        if not any([key.startswith(sw) for sw in startswith]):
-            raise _KeyError(startswith=startswith)
-        startswith = startswith[0][-1] if len(startswith) == 1 else ''.join([
-            sw[-1] for sw in startswith])
-        if 0 in [k in f"0123456789abcdef{startswith}" for k in key]:
-            print(f"0123456789abcdef{startswith[-1]}")
-            print(key)
-            raise _InvalidKeyError('Enter a valid Ziesha public key/address.')
+        err = check_key(key, startswith)
+        if err is not None:
+            raise err
         if amount is not None:
             if not isinstance(amount, (str, int, float)):
                 raise TypeError("Amount must be a number.")
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Dispatcher module
+
+Queued dispatching of wallet operations.
+"""
+# pylint: disable=C0103
+
+import queue as _queue
+import threading as _threading
+from uuid import uuid4 as _uuid4
+from time import time as _time
+
+QUEUED = 'queued'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+
+class Ticket:
+    """
+    Ticket of a queued request.
+
+    Args:
+        to (str): Address to send to.
+        amount (float): Amount to send.
+    """
+
+    def __init__(self, to, amount):
+        self.id = _uuid4().hex
+        self.to = to
+        self.amount = amount
+        self.status = QUEUED
+        self.message = ''
+        self.created_at = _time()
+        self.finished_at = None
+        self._done = _threading.Event()
+
+    def __repr__(self):
+        return f"Ticket({self.id}, {self.to}, {self.amount}, {self.status})"
+
+    @property
+    def done(self):
+        """Check if request is finished."""
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait until request is finished.
+
+        Args:
+            timeout (float): Timeout in seconds.
+        Returns:
+            bool: True if request is finished.
+        """
+        return self._done.wait(timeout)
+
+    def _finish(self, status, message):
+        """Set final status of the request."""
+        self.status = status
+        self.message = message
+        self.finished_at = _time()
+        self._done.set()
+
+
+class Dispatcher:
+    """
+    Dispatch requests through one worker thread per wallet.
+
+    Requests are accepted immediately and a ticket is returned. Each worker
+    drains its queue in batches and hands every batch to `send_batch`.
+
+    Args:
+        send_batch (callable): Called with (wallet, tickets). Must finish
+            every ticket by calling `Dispatcher.finish`.
+        max_batch (int): Maximum number of tickets in a batch.
+        keep_sec (float): Finished tickets are kept for this many seconds.
+    """
+
+    def __init__(self, send_batch, max_batch=16, keep_sec=3600):
+        self._send_batch = send_batch
+        self._max_batch = max_batch
+        self._keep_sec = keep_sec
+        self._lock = _threading.Lock()
+        self._queues = {}
+        self._tickets = {}
+
+    def __repr__(self):
+        return f"Dispatcher({self.pending} pending)"
+
+    @property
+    def pending(self):
+        """Get number of unfinished tickets."""
+        return sum(1 for t in list(self._tickets.values()) if not t.done)
+
+    @staticmethod
+    def finish(ticket, ok, message):
+        """
+        Finish a ticket.
+
+        Args:
+            ticket (Ticket): Ticket to finish.
+            ok (bool): True if request is successful.
+            message (str): Result or error message.
+        """
+        ticket._finish(SENT if ok else FAILED, message)
+
+    def _prune(self):
+        """Drop old finished tickets."""
+        t = _time() - self._keep_sec
+        for k in [k for k, v in self._tickets.items()
+                  if v.done and v.finished_at < t]:
+            del self._tickets[k]
+
+    def _worker(self, wallet, q):
+        """Drain queue of a wallet."""
+        while True:
+            batch = [q.get()]
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(q.get_nowait())
+                except _queue.Empty:
+                    break
+            for t in batch:
+                t.status = SENDING
+            try:
+                self._send_batch(wallet, batch)
+            except Exception as e:  # pylint: disable=W0703
+                for t in batch:
+                    if not t.done:
+                        self.finish(t, False, str(e))
+
+    def submit(self, wallet, to, amount):
+        """
+        Queue a request.
+
+        Args:
+            wallet (str): Wallet to send from.
+            to (str): Address to send to.
+            amount (float): Amount to send.
+        Returns:
+            Ticket: Ticket to poll the request status.
+        """
+        ticket = Ticket(to, amount)
+        with self._lock:
+            self._prune()
+            self._tickets[ticket.id] = ticket
+            q = self._queues.get(wallet)
+            if q is None:
+                q = self._queues[wallet] = _queue.Queue()
+                _threading.Thread(target=self._worker, args=(wallet, q),
+                                  name=f'dispatcher-{wallet}',
+                                  daemon=True).start()
+        q.put(ticket)
+        return ticket
+
+    def get(self, ticket_id):
+        """
+        Get a ticket.
+
+        Args:
+            ticket_id (str): Ticket id.
+        Returns:
+            Ticket: Ticket. None if ticket is unknown or expired.
+        """
+        return self._tickets.get(ticket_id)
@@ -71,3 +71,50 @@ class FaucetDurationError(Exception):
         dur = f"{int(h):02d} hours {int(m):02d} min {int(s):02d} sec"
         self.message = f"You have to wait {dur}."
         super().__init__(self.message)
+
+
+class PoolError(Exception):
+    """Exception raised when a request to uzi-pool fails."""
+
+    def __init__(self, message=None):
+        """
+        Create a PoolError.
+
+        Args:
+            message (str): Error message.
+
+        Returns:
+            PoolError: PoolError object.
+        """
+        if message is None:
+            message = "Request to uzi-pool failed."
+        self.message = message
+        super().__init__(self.message)
+
+
+class PoolConnectionError(PoolError):
+    """Exception raised when uzi-pool cannot be reached."""
+
+
+class PoolTimeoutError(PoolError):
+    """Exception raised when uzi-pool does not answer in time."""
+
+
+class PoolHTTPError(PoolError):
+    """Exception raised when uzi-pool answers with an error status."""
+
+    def __init__(self, status_code, message=None):
+        """
+        Create a PoolHTTPError.
+
+        Args:
+            status_code (int): HTTP status code.
+            message (str): Error message.
+
+        Returns:
+            PoolHTTPError: PoolHTTPError object.
+        """
+        self.status_code = status_code
+        if message is None:
+            message = f"uzi-pool answered with HTTP {status_code}."
+        super().__init__(message)
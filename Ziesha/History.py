@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy History module
+
+Incremental index of the uzi-pool history file.
+"""
+# pylint: disable=C0103
+
+import os as _os
+import json as _json
+import atexit as _atexit
+import threading as _threading
+from hashlib import sha256 as _sha256
+from bisect import bisect_left as _bisect_left
+from datetime import datetime as _dt
+from pathlib import Path as _Path
+from time import sleep as _sleep
+from .Core import _Singleton
+
+BUCKET_SEC = 3600  # seconds
+SAVE_INTERVAL = 30  # seconds
+FINGERPRINT_SIZE = 4096  # bytes
+_FIELDS = {'token': ('token', 'miner_token', 'miner'),
+           'time': ('timestamp', 'time', 'ts'),
+           'shares': ('shares', 'share'),
+           'reward': ('reward', 'rewards', 'amount')}
+
+
+def _field(record, name, default=None):
+    """Get first present alias of a field."""
+    for k in _FIELDS[name]:
+        if k in record:
+            return record[k]
+    return default
+
+
+def _fingerprint(f, offset):
+    """Get hash of the first and last bytes of a file before an offset."""
+    f.seek(0)
+    head = f.read(min(offset, FINGERPRINT_SIZE))
+    f.seek(max(offset - FINGERPRINT_SIZE, 0))
+    tail = f.read(offset - f.tell())
+    return _sha256(head + tail).hexdigest()
+
+
+def _timestamp(value):
+    """Get seconds since epoch of a number or an ISO formatted time."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _dt.fromisoformat(str(value)).timestamp()
+
+
+class PoolHistory(metaclass=_Singleton):
+    """
+    Index of uzi-pool history by miner token and time bucket.
+
+    The history file is read as JSON lines, one record per line with a
+    miner token, a time and optionally shares and reward. New lines are
+    ingested from the last read byte offset, which is persisted together
+    with the aggregates, so the file is never read twice. The bytes before
+    the offset are fingerprinted to notice a file rewritten in place.
+
+    The index is persisted in a background thread at most every
+    `save_interval` seconds and at exit.
+
+    Args:
+        file (str, Path): History file.
+        bucket_sec (int): Size of a time bucket in seconds.
+        save_interval (float): Seconds between saves of a changed index.
+    """
+
+    def __init__(self, file='~/.uzi-pool-history', bucket_sec=BUCKET_SEC,
+                 save_interval=SAVE_INTERVAL):
+        self._file = _Path(file).expanduser()
+        self._index_file = self._file.with_name(self._file.name + '.idx')
+        self._bucket_sec = bucket_sec
+        self._save_interval = save_interval
+        self._lock = _threading.Lock()
+        self._dirty = False
+        self._saver = None
+        self._stamp = None
+        self._reset()
+        self._load_index()
+        _atexit.register(self.flush)
+
+    def __repr__(self):
+        return f"PoolHistory({len(self._miners)} miners, " + \
+               f"{len(self._totals)} buckets, offset {self._offset})"
+
+    def _reset(self):
+        """Drop the index."""
+        self._offset, self._inode, self._fingerprint = 0, None, None
+        self._miners, self._totals = {}, {}
+        self._keys = {}
+
+    def _load_index(self):
+        """Load persisted index."""
+        try:
+            state = _json.loads(self._index_file.read_text())
+        except (OSError, ValueError):
+            return
+        if state.get('bucket_sec') != self._bucket_sec or \
+                'fingerprint' not in state:
+            return
+        self._offset, self._inode = state['offset'], state['inode']
+        self._fingerprint = state['fingerprint']
+        self._totals = {int(b): v for b, v in state['totals'].items()}
+        self._miners = {t: {int(b): v for b, v in d.items()}
+                        for t, d in state['miners'].items()}
+
+    def save(self):
+        """Persist index and read offset."""
+        with self._lock:
+            self._dirty = False
+            state = {'offset': self._offset, 'inode': self._inode,
+                     'fingerprint': self._fingerprint,
+                     'bucket_sec': self._bucket_sec, 'totals': self._totals,
+                     'miners': self._miners}
+            tmp = self._index_file.with_name(
+                f'.{self._index_file.name}.{_os.getpid()}.tmp')
+            tmp.write_text(_json.dumps(state))
+            _os.replace(tmp, self._index_file)
+
+    def flush(self):
+        """Persist index if it changed since last save."""
+        if self._dirty:
+            try:
+                self.save()
+            except OSError:
+                pass
+
+    def _save_later(self):
+        """Save index in background after the save interval."""
+        if self._saver is not None and self._saver.is_alive():
+            return
+
+        def run():
+            _sleep(self._save_interval)
+            self.flush()
+        self._saver = _threading.Thread(target=run, name='pool-history',
+                                        daemon=True)
+        self._saver.start()
+
+    def _add(self, record):
+        """Add a record to the index."""
+        token = _field(record, 'token')
+        t = _field(record, 'time')
+        if token is None or t is None:
+            return False
+        bucket = int(_timestamp(t) // self._bucket_sec * self._bucket_sec)
+        shares = float(_field(record, 'shares', 1))
+        reward = float(_field(record, 'reward', 0))
+        token = str(token)
+        for agg_id, agg in ((token, self._miners.setdefault(token, {})),
+                            (None, self._totals)):
+            v = agg.get(bucket)
+            if v is None:
+                v = agg[bucket] = [0.0, 0.0]
+                self._keys.pop(agg_id, None)
+            v[0] += shares
+            v[1] += reward
+        return True
+
+    def update(self):
+        """
+        Ingest lines appended since last update.
+
+        The index is rebuilt if the file was replaced, truncated or
+        rewritten.
+
+        Returns:
+            int: Number of ingested records.
+        """
+        try:
+            st = self._file.stat()
+        except OSError:
+            return 0
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return 0
+        with self._lock:
+            with self._file.open('rb') as f:
+                if st.st_ino != self._inode or st.st_size < self._offset or \
+                        _fingerprint(f, self._offset) != self._fingerprint:
+                    self._reset()
+                    self._inode = st.st_ino
+                    self._fingerprint = _fingerprint(f, 0)
+                f.seek(self._offset)
+                data = f.read(st.st_size - self._offset)
+                end = data.rfind(b'\n') + 1
+                n = 0
+                for line in data[:end].splitlines():
+                    try:
+                        n += self._add(_json.loads(line))
+                    except (ValueError, TypeError, AttributeError):
+                        continue
+                if end > 0:
+                    self._offset += end
+                    self._fingerprint = _fingerprint(f, self._offset)
+                    self._dirty = True
+            self._stamp = stamp
+        if self._dirty:
+            self._save_later()
+        return n
+
+    def _sorted(self, agg_id, agg):
+        """Get sorted bucket keys of an aggregate. Called under the lock."""
+        keys = self._keys.get(agg_id)
+        if keys is None:
+            keys = self._keys[agg_id] = sorted(agg)
+        return keys
+
+    def _window(self, agg_id, start=None, end=None):
+        """
+        Get copies of the buckets of an aggregate in [start, end).
+
+        The lock is held while the sorted keys are cached and read, so a
+        bucket added meanwhile is never left out of the cache.
+
+        Args:
+            agg_id (str): Miner token. None for the totals.
+        Returns:
+            list: (bucket, (shares, rewards)) tuples.
+        """
+        with self._lock:
+            agg = self._totals if agg_id is None else \
+                self._miners.get(agg_id, {})
+            keys = self._sorted(agg_id, agg)
+            i = 0 if start is None else _bisect_left(
+                keys, start // self._bucket_sec * self._bucket_sec)
+            j = len(keys) if end is None else _bisect_left(keys, end)
+            return [(k, tuple(agg[k])) for k in keys[i:j]]
+
+    @staticmethod
+    def _time(value):
+        """Get seconds since epoch of a datetime or number."""
+        if value is None or isinstance(value, (int, float)):
+            return value
+        return value.timestamp()
+
+    def miner(self, token, start=None, end=None):
+        """
+        Get shares and rewards of a miner in a window.
+
+        Windows are aligned to buckets.
+
+        Args:
+            token (str): Miner token.
+            start (datetime, float): Window start. Default is the beginning.
+            end (datetime, float): Window end. Default is the end.
+        Returns:
+            tuple: (shares, rewards).
+        """
+        self.update()
+        shares = rewards = 0.0
+        for _, (s, r) in self._window(str(token), self._time(start),
+                                      self._time(end)):
+            shares += s
+            rewards += r
+        return shares, rewards
+
+    def shares(self, token, start=None, end=None):
+        """Get shares of a miner in a window."""
+        return self.miner(token, start, end)[0]
+
+    def rewards(self, token, start=None, end=None):
+        """Get rewards of a miner in a window."""
+        return self.miner(token, start, end)[1]
+
+    def totals(self, start=None, end=None):
+        """
+        Get pool totals by time bucket.
+
+        Args:
+            start (datetime, float): Window start. Default is the beginning.
+            end (datetime, float): Window end. Default is the end.
+        Returns:
+            dict: (shares, rewards) by bucket start time.
+        """
+        self.update()
+        return {_dt.fromtimestamp(k): v for k, v in self._window(
+            None, self._time(start), self._time(end))}
+
+    @property
+    def tokens(self):
+        """Get tokens of miners in the history."""
+        self.update()
+        with self._lock:
+            return list(self._miners)
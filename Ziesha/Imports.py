@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Imports module
+
+Lazy module loading and import-time report.
+"""
+# pylint: disable=C0103
+
+import sys as _sys
+import threading as _threading
+from importlib import import_module as _import_module
+from time import perf_counter as _perf_counter
+
+_report = {}
+_lock = _threading.Lock()
+
+
+def timed_import(name):
+    """
+    Import a module and record how long the first import took.
+
+    Args:
+        name (str): Module name.
+    Returns:
+        module: Imported module.
+    """
+    if name in _sys.modules:
+        return _sys.modules[name]
+    start = _perf_counter()
+    module = _import_module(name)
+    with _lock:
+        _report.setdefault(name, _perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """
+    Module proxy which imports the module on first attribute access.
+
+    Args:
+        name (str): Module name.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def _load(self):
+        """Import the module."""
+        if self._module is None:
+            self.__dict__['_module'] = timed_import(self._name)
+        return self._module
+
+
+def lazy(name):
+    """
+    Get a lazily imported module.
+
+    Args:
+        name (str): Module name.
+    Returns:
+        LazyModule: Module proxy.
+    """
+    return LazyModule(name)
+
+
+def report():
+    """
+    Get import-time report.
+
+    Returns:
+        str: Modules and their first import time, slowest first.
+    """
+    with _lock:
+        items = sorted(_report.items(), key=lambda i: i[1], reverse=True)
+    return '\n'.join(f"{t * 1000:9.1f} ms  {n}" for n, t in items)
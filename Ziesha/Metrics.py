@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Metrics module
+
+Counters, gauges and histograms exported in Prometheus text format.
+"""
+# pylint: disable=C0103
+
+import os as _os
+import threading as _threading
+from bisect import bisect_left as _bisect_left
+from http.server import BaseHTTPRequestHandler as _BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer as _ThreadingHTTPServer
+
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = int(_os.environ.get('ZIESHA_METRICS_PORT', 9108))
+BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)  # seconds
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    """Escape a label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    """Format a label set."""
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    """Format a sample value."""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    Base class of labelled metrics.
+
+    Args:
+        name (str): Metric name.
+        doc (str): Help text.
+        labels (tuple): Label names.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name, doc, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = _threading.Lock()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+    def _key(self, labels):
+        """Get label values in label name order."""
+        return tuple(str(labels.get(n, '')) for n in self.labels)
+
+    def _samples(self):
+        """Yield (suffix, label string, value) of every sample."""
+        with self._lock:
+            values = {k: v for k, v in self._values.items()}
+        for k, v in sorted(values.items()):
+            yield '', _labels(self.labels, k), v
+
+    def render(self):
+        """Get the metric in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.doc}",
+                 f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{self.name}{suffix}{labels} {_number(v)}"
+                  for suffix, labels, v in self._samples()]
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter of a label set."""
+        k = self._key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0) + amount
+
+    def value(self, **labels):
+        """Get the counter of a label set."""
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """
+    Value which can go up and down.
+
+    Args:
+        name (str): Metric name.
+        doc (str): Help text.
+        labels (tuple): Label names.
+        collect (callable): Function called at scrape time, returning a dict
+            of values by label value tuple. Replaces values set by `set`.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, doc, labels=(), collect=None):
+        super().__init__(name, doc, labels)
+        self._collect = collect
+
+    def set(self, value, **labels):
+        """Set the gauge of a label set."""
+        k = self._key(labels)
+        with self._lock:
+            self._values[k] = value
+
+    def _samples(self):
+        if self._collect is not None:
+            try:
+                values = self._collect()
+            except Exception:  # pylint: disable=W0703
+                values = {}
+            with self._lock:
+                self._values = {
+                    tuple(str(i) for i in k): v for k, v in values.items()
+                    if v is not None}
+        return super()._samples()
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in cumulative buckets.
+
+    Args:
+        name (str): Metric name.
+        doc (str): Help text.
+        labels (tuple): Label names.
+        buckets (tuple): Upper bounds of the buckets.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, doc, labels=(), buckets=BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """Add an observation to the histogram of a label set."""
+        k = self._key(labels)
+        i = _bisect_left(self.buckets, value)
+        with self._lock:
+            v = self._values.get(k)
+            if v is None:
+                v = self._values[k] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            v[0][i] += 1
+            v[1] += value
+            v[2] += 1
+
+    def _samples(self):
+        with self._lock:
+            values = {k: ([*v[0]], v[1], v[2]) for k, v in self._values.items()}
+        for k, (counts, total, n) in sorted(values.items()):
+            cum = 0
+            for le, c in zip(self.buckets + (float('inf'),), counts):
+                cum += c
+                yield '_bucket', _labels(self.labels, k,
+                                         ('le', _number(float(le)))), cum
+            yield '_sum', _labels(self.labels, k), total
+            yield '_count', _labels(self.labels, k), n
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = _threading.Lock()
+
+    def __repr__(self):
+        return f"Registry({', '.join(self._metrics)})"
+
+    def _get(self, cls, name, *args, **kwargs):
+        """Get a metric, creating it on first use."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name, doc, labels=()):
+        """Get or create a Counter."""
+        return self._get(Counter, name, doc, labels)
+
+    def gauge(self, name, doc, labels=(), collect=None):
+        """Get or create a Gauge."""
+        return self._get(Gauge, name, doc, labels, collect)
+
+    def histogram(self, name, doc, labels=(), buckets=BUCKETS):
+        """Get or create a Histogram."""
+        return self._get(Histogram, name, doc, labels, buckets)
+
+    def render(self):
+        """Get all metrics in Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+render = REGISTRY.render
+
+
+class _Handler(_BaseHTTPRequestHandler):
+    """Serve the registry on GET /metrics."""
+
+    registry = REGISTRY
+
+    def do_GET(self):  # pylint: disable=C0116
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        pass
+
+
+_server = None
+_server_lock = _threading.Lock()
+
+
+def serve(port=METRICS_PORT, host=METRICS_HOST):
+    """
+    Serve metrics over HTTP in a background thread.
+
+    Only the first call starts a server. If the port is taken, e.g. by
+    another worker process, no server is started.
+
+    Args:
+        port (int): Port to listen on.
+        host (str): Address to listen on. Default is localhost only.
+    Returns:
+        ThreadingHTTPServer: Running server. None if the port is taken.
+    """
+    global _server  # pylint: disable=W0603
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = _ThreadingHTTPServer((host, port), _Handler)
+            except OSError:
+                return None
+            _server.daemon_threads = True
+            _threading.Thread(target=_server.serve_forever,
+                              name='ziesha-metrics', daemon=True).start()
+    return _server
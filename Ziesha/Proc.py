@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Proc module
+
+Process discovery by a single pass over /proc.
+"""
+# pylint: disable=C0103
+
+import os as _os
+import threading as _threading
+from time import time as _time
+
+_PROC = '/proc'
+_CLK_TCK = _os.sysconf('SC_CLK_TCK') if hasattr(_os, 'sysconf') else 100
+
+
+def _boot_time():
+    """Get system boot time in seconds since epoch."""
+    try:
+        with open(f'{_PROC}/stat', 'rb') as f:
+            for line in f:
+                if line.startswith(b'btime'):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return 0.0
+
+
+_BOOT_TIME = _boot_time()
+
+
+class ProcInfo:
+    """
+    Static information of a process.
+
+    Args:
+        pid (int): Process id.
+        starttime (int): Start time in clock ticks after boot.
+        name (str): Process name.
+        cmdline (list): Process arguments.
+        exe (str): Resolved path of the executable.
+    """
+
+    def __init__(self, pid, starttime, name, cmdline, exe):
+        self.pid = pid
+        self.starttime = starttime
+        self.name = name
+        self.cmdline = cmdline
+        self.exe = exe
+
+    def __repr__(self):
+        return f"{self.pid}: {self.args}"
+
+    @property
+    def key(self):
+        """Get (pid, create_time) key of the process."""
+        return (self.pid, self.create_time)
+
+    @property
+    def create_time(self):
+        """Get process creation time in seconds since epoch."""
+        return _BOOT_TIME + self.starttime / _CLK_TCK
+
+    @property
+    def args(self):
+        """Get process arguments as a string."""
+        return ' '.join(self.cmdline)
+
+    @property
+    def opts(self):
+        """Get process options."""
+        a = self.cmdline
+        return {a[i].replace('--', ''): a[i + 1]
+                for i in range(len(a) - 1) if a[i].startswith('--')}
+
+    @property
+    def elapsed(self):
+        """Get process elapsed time formatted as `[[dd-]hh:]mm:ss`."""
+        sec = max(int(_time() - self.create_time), 0)
+        m, s = divmod(sec, 60)
+        h, m = divmod(m, 60)
+        d, h = divmod(h, 24)
+        if d > 0:
+            return f"{d}-{h:02d}:{m:02d}:{s:02d}"
+        if h > 0:
+            return f"{h:02d}:{m:02d}:{s:02d}"
+        return f"{m:02d}:{s:02d}"
+
+    def matches(self, filter=None):
+        """
+        Check process arguments against filter.
+
+        Args:
+            filter (str, list): Strings that must all be in the arguments.
+        Returns:
+            bool: True if all filters match.
+        """
+        if filter is None:
+            return True
+        if not isinstance(filter, list):
+            filter = [filter]
+        args = self.args
+        return all(f in args for f in filter)
+
+
+def _read_stat(pid):
+    """Get (name, starttime) of a process from /proc/<pid>/stat."""
+    with open(f'{_PROC}/{pid}/stat', 'rb') as f:
+        stat = f.read()
+    i, j = stat.index(b'('), stat.rindex(b')')
+    return stat[i + 1:j].decode('utf-8', 'replace'), int(stat[j + 2:].split()[19])
+
+
+def _read_info(pid, name, starttime):
+    """Read cmdline and executable path of a process."""
+    with open(f'{_PROC}/{pid}/cmdline', 'rb') as f:
+        cmdline = [a.decode('utf-8', 'replace')
+                   for a in f.read().split(b'\0') if a != b'']
+    try:
+        exe = _os.path.realpath(_os.readlink(f'{_PROC}/{pid}/exe'))
+    except OSError:
+        exe = ''
+    return ProcInfo(pid, starttime, name, cmdline, exe)
+
+
+class _ProcCache:
+    """Cache of process information keyed by (pid, starttime)."""
+
+    def __init__(self):
+        self._lock = _threading.Lock()
+        self._info = {}
+
+    def scan(self, name, filter=None):
+        """
+        Find running processes.
+
+        Args:
+            name (str): Process name or a part of it.
+            filter (str, list): Strings that must all be in the arguments.
+        Returns:
+            list: Matching ProcInfo objects ordered by pid.
+        """
+        return self.scan_many([(name, filter)])[0]
+
+    def scan_many(self, targets):
+        """
+        Find running processes of several targets in one pass.
+
+        Args:
+            targets (list): List of (name, filter) pairs.
+        Returns:
+            list: List of matching ProcInfo lists, one per target.
+        """
+        found, seen = [[] for _ in targets], set()
+        pids = sorted(int(p) for p in _os.listdir(_PROC) if p.isdigit())
+        for pid in pids:
+            try:
+                comm, starttime = _read_stat(pid)
+            except (OSError, ValueError, IndexError):
+                continue
+            seen.add((pid, starttime))
+            hits = [i for i, (name, _) in enumerate(targets) if name in comm]
+            if len(hits) == 0:
+                continue
+            info = self._info.get((pid, starttime))
+            if info is None:
+                try:
+                    info = _read_info(pid, comm, starttime)
+                except OSError:
+                    continue
+                with self._lock:
+                    self._info[(pid, starttime)] = info
+            for i in hits:
+                if info.matches(targets[i][1]):
+                    found[i].append(info)
+        with self._lock:
+            for k in set(self._info) - seen:
+                del self._info[k]
+        return found
+
+
+_cache = _ProcCache()
+
+
+def scan(name, filter=None):
+    """
+    Find running processes by name and argument filter.
+
+    Args:
+        name (str): Process name or a part of it.
+        filter (str, list): Strings that must all be in the arguments.
+    Returns:
+        list: Matching ProcInfo objects ordered by pid.
+    """
+    return _cache.scan(name, filter)
+
+
+def scan_many(targets):
+    """
+    Find running processes of several targets in one pass over /proc.
+
+    Args:
+        targets (list): List of (name, filter) pairs.
+    Returns:
+        list: List of matching ProcInfo lists, one per target.
+    """
+    return _cache.scan_many(targets)
+
+
+def find(name, filter=None):
+    """
+    Find the first running process by name and argument filter.
+
+    Args:
+        name (str): Process name or a part of it.
+        filter (str, list): Strings that must all be in the arguments.
+    Returns:
+        ProcInfo: Process information.
+    Raises:
+        ValueError: If process is not running.
+    """
+    found = scan(name, filter)
+    if len(found) == 0:
+        raise ValueError(f"'{name}' is not running")
+    return found[0]
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Sampler module
+
+Background sampler of Ziesha tool process status.
+"""
+# pylint: disable=C0103
+
+import threading as _threading
+from time import time as _time
+from psutil import Process as _Process
+from psutil import Error as _PsutilError
+from .Core import _Singleton
+from . import Proc as _proc
+from . import Metrics as _metrics
+
+TARGETS = [('bazuka', 'node start'), ('zoro', 'prove'), ('zoro', 'pack'),
+           ('uzi-pool', '--node'), ('uzi-miner', '--node')]
+
+
+class ProcStatus:
+    """
+    Status of a tool process at sampling time.
+
+    Args:
+        info (ProcInfo): Process information. None if not running.
+        cpu (float): CPU usage in percent.
+        rss (int): Resident memory in bytes.
+        sampled_at (float): Sampling time in seconds since epoch.
+    """
+
+    def __init__(self, info=None, cpu=0.0, rss=0, sampled_at=None):
+        self.info = info
+        self.cpu = cpu
+        self.rss = rss
+        self.sampled_at = _time() if sampled_at is None else sampled_at
+
+    def __repr__(self):
+        if not self.running:
+            return "Not running"
+        return f"PID {self.pid}: {self.cpu:.1f}% CPU, " + \
+               f"{self.rss / 2**20:.1f} MiB, up {self.uptime:.0f}s"
+
+    @property
+    def running(self):
+        """Check if process is running."""
+        return self.info is not None
+
+    @property
+    def pid(self):
+        """Get process id."""
+        return None if self.info is None else self.info.pid
+
+    @property
+    def uptime(self):
+        """Get process uptime in seconds at sampling time."""
+        if self.info is None:
+            return 0.0
+        return max(self.sampled_at - self.info.create_time, 0.0)
+
+
+class ProcessSampler(metaclass=_Singleton):
+    """
+    Periodically sample status of Ziesha tool processes.
+
+    The interval drops to `min_interval` whenever a process starts, stops
+    or changes pid and doubles up to `max_interval` while nothing changes.
+
+    Args:
+        min_interval (float): Shortest sampling interval in seconds.
+        max_interval (float): Longest sampling interval in seconds.
+    """
+
+    def __init__(self, min_interval=1.0, max_interval=30.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._targets = list(TARGETS)
+        self._status = {}
+        self._procs = {}
+        self._lock = _threading.Lock()
+        self._wake = _threading.Event()
+        self._start_lock = _threading.Lock()
+        self._thread = None
+
+    def __repr__(self):
+        return '\n'.join(f"{n} [{f}]: {s}"
+                         for (n, f), s in self._status.items())
+
+    @staticmethod
+    def _key(name, filter=None):
+        """Get hashable target key."""
+        if isinstance(filter, list):
+            filter = tuple(filter)
+        return (name, filter)
+
+    def _measure(self, info):
+        """Get CPU and RSS of a process."""
+        p = self._procs.get(info.key)
+        try:
+            if p is None:
+                p = self._procs[info.key] = _Process(info.pid)
+            return p.cpu_percent(None), p.memory_info().rss
+        except _PsutilError:
+            return None
+
+    def sample(self):
+        """
+        Take a snapshot of all watched targets.
+
+        Returns:
+            bool: True if any target started, stopped or changed pid.
+        """
+        with self._lock:
+            targets = list(self._targets)
+        found = _proc.scan_many(
+            [(n, list(f) if isinstance(f, tuple) else f) for n, f in targets])
+        now, status, alive = _time(), {}, set()
+        for target, infos in zip(targets, found):
+            st = ProcStatus(sampled_at=now)
+            for info in infos:
+                usage = self._measure(info)
+                if usage is not None:
+                    st = ProcStatus(info, *usage, sampled_at=now)
+                    alive.add(info.key)
+                    break
+            status[target] = st
+        with self._lock:
+            changed = any(
+                target not in self._status or
+                self._status[target].pid != st.pid
+                for target, st in status.items())
+            self._status.update(status)
+            for k in set(self._procs) - alive:
+                del self._procs[k]
+        return changed
+
+    def _run(self):
+        """Sampling loop."""
+        while True:
+            try:
+                changed = self.sample()
+            except OSError:
+                changed = True
+            self.interval = self.min_interval if changed else \
+                min(self.interval * 2, self.max_interval)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        """Start background sampling."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.sample()
+            thread = _threading.Thread(
+                target=self._run, name='ziesha-sampler', daemon=True)
+            thread.start()
+            self._thread = thread
+
+    def watch(self, name, filter=None):
+        """
+        Add a target to sample.
+
+        Args:
+            name (str): Process name.
+            filter (str, list): Process filter.
+        """
+        key = self._key(name, filter)
+        with self._lock:
+            if key in self._targets:
+                return
+            self._targets.append(key)
+        self.sample()
+        self._wake.set()
+
+    def snapshot(self):
+        """Get last sampled status of all targets without sampling."""
+        with self._lock:
+            return dict(self._status)
+
+    def status(self, name, filter=None):
+        """
+        Get last sampled status of a target.
+
+        Args:
+            name (str): Process name.
+            filter (str, list): Process filter.
+        Returns:
+            ProcStatus: Process status.
+        """
+        self.start()
+        key = self._key(name, filter)
+        if key not in self._status:
+            self.watch(name, filter)
+        return self._status[key]
+
+
+def _collect(value):
+    """Get a scrape time collector of a ProcStatus value."""
+    def collect():
+        return {(n, ' '.join(f) if isinstance(f, tuple) else f or ''):
+                value(st) for (n, f), st in ProcessSampler().snapshot().items()}
+    return collect
+
+
+_labels = ('tool', 'filter')
+_metrics.gauge('ziesha_tool_up', 'Tool process is running (1) or not (0).',
+               _labels, _collect(lambda st: int(st.running)))
+_metrics.gauge('ziesha_tool_cpu_percent', 'CPU usage of tool processes.',
+               _labels, _collect(lambda st: st.cpu if st.running else None))
+_metrics.gauge('ziesha_tool_rss_bytes', 'Resident memory of tool processes.',
+               _labels, _collect(lambda st: st.rss if st.running else None))
+_metrics.gauge('ziesha_tool_uptime_seconds', 'Uptime of tool processes.',
+               _labels, _collect(lambda st: st.uptime if st.running else None))
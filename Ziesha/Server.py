@@ -8,65 +8,56 @@ Miners Module
 
 from pathlib import Path as _Path
 from psutil import Process as _Process
-import subprocess as _subp
+import shlex as _shlex
 import json as _json
+import threading as _threading
+from time import monotonic as _monotonic
 # from pprint import pprint as _pprint
 from datetime import datetime as _dt
-from .Core import _Singleton, run_cmd
+from .Core import _Multiton, _Singleton, run_cmd
+from .Core import run as _run
 from .Core import Key as _Key
 from .Core import PubKey as _PubKey
 from .Core import MPNWallet as _MPNWallet
+from . import Badge as _badge
+from . import Proc as _proc
+from .History import PoolHistory as _PoolHistory
+from .Supervisor import Supervisor as _Supervisor
+from .Dispatcher import Dispatcher as _Dispatcher
+from .Store import FaucetStore as _FaucetStore
+from .Sampler import ProcessSampler as _ProcessSampler
+from .Tools import TOOLS as _TOOLS
+from .Tools import ToolRegistry as _ToolRegistry
+from . import Metrics as _metrics
+from .Trace import traced as _traced
 from .Exceptions import FaucetDurationError as _FaucetDurationError
 
+WALLET_TTL = 5  # seconds
+STREAM_SIZE = 8 * 2**20  # bytes
+
+_faucet_total = _metrics.counter(
+    'ziesha_faucet_requests_total', 'Faucet requests by outcome.',
+    ('outcome',))
+
 
 class Process(_Process):
     """Process class."""
 
-    def __init__(self, name, filter=None):
+    def __init__(self, name, filter=None, info=None):
         """
         Init Process class.
 
         Args:
             name (str): Process name.
             filter (str): Process filter.
+            info (ProcInfo): Already discovered process information.
         Raises:
             ValueError: If process is not running.
         """
-        if isinstance(filter, str):
-            filter = [filter]
-        super().__init__(int(Process._get_pid(name, filter)))
-
-    @staticmethod
-    def _filter(ls, filter):
-        """
-        Filter list.
-
-        Args:
-            ls (dict): List to filter.
-            filter (list): Filter list.
-        Returns:
-            dict: Filtered list.
-        """
-        if filter is None:
-            return ls
-        if not isinstance(filter, list):
-            filter = [filter]
-        return {pid: arg for pid, arg in ls.items()
-                if all(f in arg for f in filter)}
-
-    @staticmethod
-    def _get_args(pid):
-        """
-        Get process arguments.
-
-        Args:
-            pid (int): Process id.
-        Returns:
-            dict: Process arguments.
-        """
-        if isinstance(pid, list):
-            return {k: v for p in pid for k, v in Process._get_args(p).items()}
-        return {pid: run_cmd("ps", "-p", pid, "-o", "args=")}
+        if info is None:
+            info = _proc.find(name, filter)
+        self._info = info
+        super().__init__(info.pid)
 
     @staticmethod
     def _get_pid(name, filter=None):
@@ -79,13 +70,7 @@ class Process(_Process):
         Returns:
             int: Process id.
         """
-        pid = run_cmd("pgrep", name).split('\n')
-        if len(pid) == 1 and pid[0] == '':
-            raise ValueError(f"'{name}' is not running")
-        args = Process._filter(Process._get_args(pid), filter)
-        if len(args) == 0:
-            raise ValueError(f"'{name}' is not running")
-        return list(args.keys())[0]
+        return _proc.find(name, filter).pid
 
     @property
     def id(self):
@@ -95,29 +80,29 @@ class Process(_Process):
     @property
     def path(self):
         """Get process path."""
-        return run_cmd("readlink", "-f", f"/proc/{self.id}/exe")
+        return self._info.exe
 
     @property
     def cmd(self):
         """Get process command."""
-        return ' '.join(self.cmdline())
+        return self._info.args
 
     @property
     def opts(self):
         """Get process options."""
-        a = self.cmdline()
-        return {a[a.index(i)].replace('--', ''): a[a.index(i) + 1]
-                for i in a if i.startswith('--')}
+        return self._info.opts
 
     @property
     def elapsed(self):
         """Get process elapsed time."""
-        return run_cmd("ps", "-p", str(self.id), "-o", "etime=")
+        return self._info.elapsed
 
 
 class ZieshaTool:
     """Ziesha Tool class."""
 
+    _filter = None
+
     def __init__(self, name, color='green'):
         """
         Init ZieshaTool class.
@@ -129,41 +114,42 @@ class ZieshaTool:
             ValueError: If tool is not a Ziesha tool.
             ValueError: If tool is not installed.
         """
-        tools = ['bazuka', 'zoro', 'uzi-pool', 'uzi-miner']
-        if name not in tools:
-            raise ValueError(f"'name' must be one of {tools}")
-        path = run_cmd("which", name)
-        if path == '':
+        if name not in _TOOLS:
+            raise ValueError(f"'name' must be one of {_TOOLS}")
+        if not _ToolRegistry().get(name).is_installed:
             raise ValueError(f"'{name}' is not installed")
-        self._path = _Path(path)
         self.name = name
         self.color = color
 
     def __repr__(self):
         """Return string representation of ZieshaTool class."""
         txt = f"{self.name.title()} (v{self.version}):\n"
-        if self.is_running:
-            txt += f"  PID  : {self.proc.id}\n"
+        status = self.status
+        if status.running:
+            txt += f"  PID  : {status.pid}\n"
             txt += f"  PATH : {self.path}\n"
             txt += f"  OPTS :\n"
-            for k, v in self.proc.opts.items():
+            for k, v in status.info.opts.items():
                 txt += f"    {k} : {v}\n"
         else:
             txt += " Not running\n"
         return txt
 
     @property
+    @_traced
     def is_running(self):
         """Check if tool is running."""
-        try:
-            return self.proc.is_running
-        except ValueError:
-            return False
+        return self.status.running
+
+    @property
+    def info(self):
+        """Get cached tool metadata."""
+        return _ToolRegistry().get(self.name)
 
     @property
     def path(self):
         """Get tool path."""
-        return self._path
+        return _Path(self.info.path)
 
     @property
     def home(self):
@@ -178,16 +164,26 @@ class ZieshaTool:
     @property
     def is_installed(self):
         """Check if tool is installed."""
-        return not run_cmd("which", self.name) == ''
+        return self.info.is_installed
 
     @property
     def github(self):
         """Get link to GitHub."""
         return f"https://github.com/ziesha-network/{self.name}"
 
+    @property
+    def label(self):
+        """Get badge label."""
+        return self.name.title()
+
+    @property
+    def badge_color(self):
+        """Get badge color."""
+        return self.color if self.is_running else 'red'
+
     def _get_shieldsio(self, name):
         """Get shields.io badge."""
-        col = self.color if self.is_running else 'red'
+        col = self.badge_color
         name = name.replace('-', '--') if '-' in name else name
         url = "https://img.shields.io/badge"
         return f"{url}/{name}-{self.version}-{col}"
@@ -195,28 +191,45 @@ class ZieshaTool:
     @property
     def shieldsio(self):
         """Get shields.io badge."""
-        return self._get_shieldsio(self.name.title())
+        return self._get_shieldsio(self.label)
+
+    @property
+    def badge(self):
+        """Get locally rendered badge as a data URI."""
+        return _badge.data_uri(self.label, self.version, self.badge_color)
 
     @property
+    @_traced
     def shieldsio_link(self):
-        """Get shields.io badge with link."""
+        """Get badge with link."""
         hint = 'Running' if self.is_running else 'Not Running'
         return f'<a href="{self.github}" title="{hint}" target="_blank" rel="nofollow">' + \
-               f'<img src="{self.shieldsio}"' + \
+               f'<img src="{self.badge}" ' + \
                f'alt="Installed {self.name.title()} version"></a>'
 
     @property
+    @_traced
     def version(self):
         """Get tool version."""
-        ret = run_cmd(self.name, "--version")
-        if self.name != 'bazuka':
-            ret = ret.split('\n')[-1]
-        return ret.split(' ')[-1]
+        return self.info.version
+
+    @property
+    def status(self):
+        """Get last sampled process status."""
+        return _ProcessSampler().status(self.name, self._filter)
 
     @property
     def proc(self):
-        """Get process."""
-        return Process(self.name)
+        """
+        Get process.
+
+        Raises:
+            ValueError: If process is not running.
+        """
+        status = self.status
+        if not status.running:
+            raise ValueError(f"'{self.name}' is not running")
+        return Process(self.name, info=status.info)
 
 
 class Key(_Key):
@@ -224,7 +237,7 @@ class Key(_Key):
 
     def _run_(self, *args):
         """Run wallet command."""
-        return run_cmd(Bazuka().name, 'wallet', 'send', *args)
+        return Wallet().send(*args)
 
     def send(self, to, amount):
         """
@@ -262,9 +275,6 @@ class Key(_Key):
 
         ret = self._run_('--from', self, '--to',
                          to, '--amount', str(amount))
-        print(self)
-        print(ret)
-        return
         if ret in ['PostMpnDepositResponse', 'PostMpnTransactionResponse']:
             return True
         raise ValueError(ret)
@@ -278,46 +288,112 @@ class MPNWallet(_MPNWallet, Key):
     pass
 
 
+class WalletSnapshot:
+    """
+    Parsed output of `bazuka wallet info`.
+
+    Args:
+        raw (str): Output of `bazuka wallet info`.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.taken_at = _monotonic()
+        self.sections = [self._parse(i) for i in raw.split('\n\n')]
+
+    def __repr__(self):
+        return self.raw
+
+    @staticmethod
+    def _parse(section):
+        """Get (address, amount) of a section."""
+        address, amount = None, None
+        for i in section.split('\n'):
+            if address is None and i.startswith('Address'):
+                address = i.split()[-1]
+            if amount is None and i.startswith('#'):
+                amount = i.split()[-1][:-1]
+        return address, amount
+
+    @property
+    def age(self):
+        """Get age of the snapshot in seconds."""
+        return _monotonic() - self.taken_at
+
+    @property
+    def address(self):
+        """Get wallet addresses and amounts."""
+        return {ad: float(am) for ad, am in self.sections
+                if ad is not None and am is not None}
+
+    def key(self, index=0, cls=_PubKey):
+        """
+        Get key of a section.
+
+        Args:
+            index (int): Section index.
+            cls (type): Key class.
+        Returns:
+            Key: Key with amount.
+        """
+        return cls(*self.sections[index])
+
+
 class Wallet(metaclass=_Singleton):
     """Bazuka Wallet class."""
 
-    def __init__(self):
+    def __init__(self, ttl=WALLET_TTL):
         """
         Init Bazuka Wallet class.
 
         Args:
-            tool (Bazuka): Bazuka tool.
+            ttl (float): Lifetime of cached wallet info in seconds.
         """
         self._bazuka = Bazuka()
+        self._ttl = ttl
+        self._snapshot = None
+        self._lock = _threading.Lock()
 
     def _run_(self, *args):
         """Run wallet command."""
         return run_cmd(self._bazuka.name, "wallet", *args)
 
+    def _change_(self, *args):
+        """Run wallet command which changes the wallet state."""
+        try:
+            return self._run_(*args)
+        finally:
+            self.invalidate()
+
     def __repr__(self):
         """Return string representation of Bazuka Wallet class."""
-        return self._run_("info")
+        return self.info
+
+    def invalidate(self):
+        """Drop cached wallet info."""
+        self._snapshot = None
+
+    @property
+    @_traced
+    def snapshot(self):
+        """Get parsed wallet info, refreshed after `ttl` seconds."""
+        snap = self._snapshot
+        if snap is None or snap.age > self._ttl:
+            with self._lock:
+                snap = self._snapshot
+                if snap is None or snap.age > self._ttl:
+                    snap = self._snapshot = WalletSnapshot(
+                        self._run_("info"))
+        return snap
 
     @property
     def address(self):
         """Get wallet addresses."""
-        addresses = []
-        amounts = []
-        info = self._run_("info")
-        for add in info.split('\n\n'):
-            for i in add.split('\n'):
-                if i.startswith('Address'):
-                    addresses.append(i.split()[-1])
-                if i.startswith('#'):
-                    amounts.append(float(i.split()[-1][:-1]))
-        return dict(zip(addresses, amounts))
+        return self.snapshot.address
 
     def _get_key(self, index=0, cls=_PubKey):
         """Get key."""
-        info = self._run_("info").split('\n\n')[index].split('\n')
-        ad = info[2].split()[-1]
-        am = info[3].split()[-1][:-1]
-        return cls(ad, am)
+        return self.snapshot.key(index, cls)
 
     @property
     def pub(self):
@@ -332,7 +408,23 @@ class Wallet(metaclass=_Singleton):
     @property
     def info(self):
         """Get wallet info."""
-        return self._run_("info")
+        return self.snapshot.raw
+
+    def send(self, *args):
+        """Send transaction."""
+        return self._change_("send", *args)
+
+    def send_result(self, *args):
+        """
+        Send transaction and get the full command result.
+
+        Returns:
+            CommandResult: Exit code, output and timeout of the command.
+        """
+        try:
+            return _run(self._bazuka.name, "wallet", "send", *args)
+        finally:
+            self.invalidate()
 
     def new_token(self, name, symbol, supply, decimals, fee, mintable=False):
         """Create new token."""
@@ -341,19 +433,19 @@ class Wallet(metaclass=_Singleton):
             cmd.append('--mintable')
         cmd += ['--name', name, '--symbol', symbol, '--supply', supply,
                 '--decimals', decimals, '--fee', fee]
-        return self._run_(*cmd)
+        return self._change_(*cmd)
 
     def add_token(self, id):
         """Add token."""
-        return self._run_("add-token", '--id', id)
+        return self._change_("add-token", '--id', id)
 
     def resend_pending(self):
         """Resend pending transactions."""
-        return self._run_("resend-pending")
+        return self._change_("resend-pending")
 
     def reset(self):
         """Reset wallet."""
-        return self._run_("reset")
+        return self._change_("reset")
 
 
 class Node(metaclass=_Singleton):
@@ -367,40 +459,54 @@ class Node(metaclass=_Singleton):
             tool (Bazuka): Bazuka tool.
         """
         self._bazuka = Bazuka()
+        self._supervisor = None
 
     def __repr__(self):
         """Return string representation of Bazuka Node class."""
-        return run_cmd(f"{self._tool.name} node status")
+        return run_cmd(self._bazuka.name, "node", "status")
+
+    @property
+    def supervisor(self):
+        """Get supervisor of the node started by this class."""
+        return self._supervisor
 
     def start(self, flags='', opts=''):
-        """Start node."""
-        args = ' '.join([self._tool.name, "node", "start",
-                         flags, opts]).strip()
+        """
+        Start node without blocking.
 
-        p = _subp.Popen(
-            args, shell=True, stdout=_subp.PIPE, stderr=_subp.STDOUT)
-        for line in iter(p.stdout.readline, ''):
-            print(line.strip().decode("utf-8")),
-        retval = p.wait()
-        # res = _subp.run(args.split(' '), capture_output=True)
-        # return res
-        # print(res.stdout)
-        # return run_cmd(self._tool.name, "node", "start", flags, opts)
+        Output of the node is kept in the supervisor's ring buffer and
+        parsed into events that can be subscribed to.
+
+        Args:
+            flags (str): Flags of `bazuka node start`.
+            opts (str): Options of `bazuka node start`.
+        Returns:
+            Supervisor: Supervisor of the node process.
+        """
+        if self._supervisor is not None and self._supervisor.running:
+            return self._supervisor
+        argv = [self._bazuka.name, "node", "start"] + \
+            _shlex.split(flags) + _shlex.split(opts)
+        self._supervisor = _Supervisor(argv).start()
+        return self._supervisor
+
+    def stop(self):
+        """Stop node started by this class."""
+        if self._supervisor is not None:
+            self._supervisor.stop()
 
 
 class Bazuka(ZieshaTool, metaclass=_Singleton):
     """Bazuka class."""
 
+    _filter = 'node start'
+
     def __init__(self):
         self._files = {
             'bazuka.yaml': _Path('~/.bazuka.yaml').expanduser(),
             'bazuka.wallet': _Path('~/.bazuka.wallet').expanduser()}
         super().__init__('bazuka')
 
-    @property
-    def proc(self):
-        return Process(self.name, filter='node start')
-
     @property
     def node(self):
         return Node()
@@ -420,12 +526,9 @@ class ZoroProve(ZieshaTool, metaclass=_Singleton):
         self._filter = 'prove'
 
     @property
-    def shieldsio(self):
-        """Get shields.io badge."""
-        return self._get_shieldsio(f"{self.name.title()}{self._filter.title()}")
-    @property
-    def proc(self):
-        return Process(self.name, filter=self._filter)
+    def label(self):
+        """Get badge label."""
+        return f"{self.name.title()}{self._filter.title()}"
 
 
 class ZoroPack(ZieshaTool, metaclass=_Singleton):
@@ -434,13 +537,9 @@ class ZoroPack(ZieshaTool, metaclass=_Singleton):
         self._filter = 'pack'
 
     @property
-    def shieldsio(self):
-        """Get shields.io badge."""
-        return self._get_shieldsio(f"{self.name.title()}{self._filter.title()}")
-
-    @property
-    def proc(self):
-        return Process(self.name, filter=self._filter)
+    def label(self):
+        """Get badge label."""
+        return f"{self.name.title()}{self._filter.title()}"
 
 
 class Miner:
@@ -460,32 +559,164 @@ class Miner:
         return self._token
 
 
+_DELIMITERS = frozenset(' \t\r\n,]')
+
+
+def _iter_json_array(fp, chunk_size=65536):
+    """
+    Iterate over items of a JSON array without reading the whole file.
+
+    Args:
+        fp (file): Text file with a top level JSON array.
+        chunk_size (int): Number of characters read at once.
+    Yields:
+        object: Array items.
+    """
+    decoder = _json.JSONDecoder()
+    buf, pos, eof, started = '', 0, False, False
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or buf[pos] == ','):
+            pos += 1
+        if pos < len(buf) and not started:
+            if buf[pos] != '[':
+                raise ValueError("Expected a JSON array")
+            started, pos = True, pos + 1
+            continue
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        try:
+            if pos >= len(buf):
+                raise _json.JSONDecodeError('Need more data', buf, pos)
+            item, end = decoder.raw_decode(buf, pos)
+            if not eof and (end == len(buf) or buf[end] not in _DELIMITERS):
+                # A number, e.g. '1.' of '1.5', may continue in the next
+                # chunk.
+                raise _json.JSONDecodeError('Need more data', buf, pos)
+        except _json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = fp.read(chunk_size)
+            eof = chunk == ''
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+
+
 class PoolMiners(metaclass=_Singleton):
     """Miner class."""
 
-    def __init__(self):
+    def __init__(self, stream_size=STREAM_SIZE):
+        """
+        Init PoolMiners class.
+
+        Args:
+            stream_size (int): Files larger than this many bytes are
+                parsed item by item.
+        """
         self._file = _Path('~/.uzi-pool-miners').expanduser()
+        self._stream_size = stream_size
+        self._stamp = None
+        self._miners = {}
+        self._lock = _threading.Lock()
+        self._loader = None
         self.load()
 
     def __repr__(self):
-        return str(self._miners)
+        return str(self.miners)
 
     @property
     def miners(self):
+        self.refresh(wait=False)
         return self._miners
 
     @property
     def count(self):
-        return len(self._miners)
+        return len(self.miners)
 
-    def load(self):
-        """Load Miner list."""
-        self._miners = {
-            i['token']: Miner(i['mpn_addr']['pub_key'][0], i['token'])
-            for i in _json.load(self._file.open('r'))}
+    def _get_stamp(self):
+        """Get (mtime, size) of the miners file."""
+        st = self._file.stat()
+        return (st.st_mtime_ns, st.st_size)
+
+    def refresh(self, wait=True):
+        """
+        Load Miner list if the file changed since last load.
+
+        Args:
+            wait (bool): Load in this thread. Otherwise the list is loaded
+                in a background thread and the current list stays in use
+                until it is done.
+        Returns:
+            tuple: Added and removed tokens. Empty if loading in background.
+        """
+        try:
+            stamp = self._get_stamp()
+        except OSError:
+            stamp = None
+        if stamp == self._stamp:
+            return set(), set()
+        if wait:
+            return self.load()
+        with self._lock:
+            if self._loader is None or not self._loader.is_alive():
+                self._loader = _threading.Thread(
+                    target=self._load_quietly, name='pool-miners', daemon=True)
+                self._loader.start()
+        return set(), set()
+
+    def _load_quietly(self):
+        """Load in background, keeping the current list on errors."""
+        try:
+            # Parsed item by item, so readers are not held up on the GIL
+            # for the whole file.
+            self.load(stream=True)
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            pass
+
+    def _items(self, size, stream=False):
+        """Iterate over miner records of the file."""
+        with self._file.open('r') as f:
+            if stream or size > self._stream_size:
+                yield from _iter_json_array(f)
+            else:
+                yield from _json.load(f)
+
+    def load(self, stream=False):
+        """
+        Load Miner list.
+
+        The file is parsed without holding the lock. Only added, removed or
+        changed miners are applied to a copy of the current list, which
+        then replaces it, so readers never see a half updated list.
+
+        Args:
+            stream (bool): Parse item by item whatever the file size.
+        Returns:
+            tuple: Added and removed tokens.
+        """
+        stamp = self._get_stamp()
+        wallets = {i['token']: i['mpn_addr']['pub_key'][0]
+                   for i in self._items(stamp[1], stream)}
+        with self._lock:
+            old = self._miners
+            removed = old.keys() - wallets.keys()
+            changed = [t for t, w in wallets.items()
+                       if t not in old or old[t].wallet != w]
+            if removed or changed:
+                miners = dict(old)
+                for t in removed:
+                    del miners[t]
+                for t in changed:
+                    miners[t] = Miner(wallets[t], t)
+                self._miners = miners
+            self._stamp = stamp
+        return set(changed) - old.keys(), removed
 
 
 class UziPool(ZieshaTool, metaclass=_Singleton):
+    _filter = '--node'
+
     def __init__(self):
         self._files = {
             'uzi_pool_miners': _Path('~/.uzi-pool-miners').expanduser(),
@@ -493,66 +724,172 @@ class UziPool(ZieshaTool, metaclass=_Singleton):
         super().__init__('uzi-pool')
 
     @property
-    def proc(self):
-        return Process(self.name, filter='--node')
+    def history(self):
+        """Get indexed pool history."""
+        return _PoolHistory(self._files['uzi-pool-history'])
 
 
 class UziMiner(ZieshaTool, metaclass=_Singleton):
+    _filter = '--node'
+
     def __init__(self):
         super().__init__('uzi-miner')
 
-    @property
-    def proc(self):
-        return Process(self.name, filter='--node')
 
+class Faucet(metaclass=_Multiton):
+    """
+    Faucet paying from a wallet.
+
+    There is one faucet per wallet. The cool down is set when the faucet of
+    a wallet is first created. Claims are kept per wallet in the shared
+    store, so faucets with different cool downs do not affect each other.
 
-class Faucet(metaclass=_Singleton):
+    Args:
+        wallet (str): Address of the paying wallet.
+        COOL_DOWN_SEC (float): Seconds between payouts to an address.
+    """
 
     def __init__(self, wallet, COOL_DOWN_SEC=None):
         self._file = _Path('~/.faucet.history').expanduser()
         self._wallet = MPNWallet(wallet)
-        if COOL_DOWN_SEC is None:
-            self._COOL_DOWN_SEC = 28800  # seconds
+        self._store = _FaucetStore(wallet=self._wallet)
+        self._dispatcher = _Dispatcher(self._send_batch)
+        self._COOL_DOWN_SEC = 28800 if COOL_DOWN_SEC is None \
+            else COOL_DOWN_SEC  # seconds
         self.load()
 
     def __repr__(self):
         """Return string representation of Faucet class."""
-        return str(self._wallet_list)
+        return str(self.hist)
 
     @property
     def wallet(self):
         """Return Faucet Wallet."""
         return self._wallet
 
+    @property
+    def cool_down(self):
+        """Return cool down in seconds."""
+        return self._COOL_DOWN_SEC
+
     @property
     def hist(self):
         """Return Faucet History."""
-        return self._wallet_list
+        return self._store.items()
 
     def load(self):
         """Load Faucet History."""
-        self._wallet_list = _json.load(self._file.open(
-            'r')) if self._file.exists() else dict()
-        for k, v in self._wallet_list.items():
-            self._wallet_list[MPNWallet(k)] = _dt.fromisoformat(v)
+        self._store.import_json(self._file)
+        self.save()
 
     def save(self):
         """Save Faucet History."""
-        self._wallet_list = {k: v for k, v in self._wallet_list.items()
-                             if (_dt.now() - v).total_seconds() < self._COOL_DOWN_SEC}
-        _json.dump(self._wallet_list, self._file.open(
-            'w'), indent=4, sort_keys=False, default=str)
+        self._store.expire(self._COOL_DOWN_SEC)
+
+    def _check(self, to):
+        """
+        Check cool down of an address.
 
+        Raises:
+            FaucetDurationError: If address is cooling down.
+        """
+        last = self._store.blocked(to, self._COOL_DOWN_SEC)
+        if last is not None:
+            _faucet_total.inc(outcome='cooldown')
+            raise _FaucetDurationError(
+                self._COOL_DOWN_SEC, (_dt.now() - last).total_seconds())
+
+    def _claim(self, to):
+        """
+        Claim an address in the shared store.
+
+        Raises:
+            FaucetDurationError: If address is cooling down or being paid
+                by another worker.
+        """
+        last = self._store.claim(to, self._COOL_DOWN_SEC)
+        if last is not None:
+            _faucet_total.inc(outcome='cooldown')
+            raise _FaucetDurationError(
+                self._COOL_DOWN_SEC, (_dt.now() - last).total_seconds())
+
+    @_traced
     def send(self, to, amount):
+        """
+        Send Ziesha from the faucet wallet.
+
+        The address is claimed before the payout, so workers sharing the
+        store never pay an address twice within the cool down. The claim is
+        released only if the payout was clearly rejected. If its outcome is
+        unknown, e.g. on a timeout, the claim stays pending and blocks the
+        address for the whole cool down, unless it is released by hand.
+
+        Raises:
+            FaucetDurationError: If address is cooling down.
+            ValueError: If the payout fails or its outcome is unknown.
+        """
         a, f, t = str(float(amount)), self._wallet, MPNWallet(to)
-        if t in self._wallet_list.keys():
-            d = _dt.now() - self._wallet_list[t]
-            if d.total_seconds() < self._COOL_DOWN_SEC:
-                raise _FaucetDurationError(self._COOL_DOWN_SEC, d.total_seconds())
-        ret = run_cmd(f"bazuka wallet send --from {f} --to {t} --amount {a}")
-        print(ret)
-        if ret in ['PostMpnDepositResponse', 'PostMpnTransactionResponse']:
-            self._wallet_list[t] = _dt.now()
-            self.save()
+        self._claim(t)
+        try:
+            res = Wallet().send_result("--from", f, "--to", t, "--amount", a)
+        except BaseException:
+            _faucet_total.inc(outcome='unknown')
+            raise
+        if res.stdout in ['PostMpnDepositResponse', 'PostMpnTransactionResponse']:
+            self._store.confirm(t)
+            _faucet_total.inc(outcome='sent')
             return f"Sent {amount}tℤ to {to}."
-        raise ValueError(ret)
+        if self._rejected(res):
+            self._store.release(t)
+            _faucet_total.inc(outcome='failed')
+            raise ValueError(res.stderr or res.stdout)
+        _faucet_total.inc(outcome='unknown')
+        raise ValueError(f"Payout to {to} may not have been sent: " +
+                         (res.stderr or res.stdout or 'no response'))
+
+    @staticmethod
+    def _rejected(res):
+        """Check if a send command surely did not pay."""
+        if res.timed_out:
+            return False
+        if res.returncode is None:
+            # The command could not be started.
+            return True
+        return res.returncode != 0 and (res.stdout or res.stderr) != ''
+
+
+    def _send_batch(self, wallet, tickets):
+        """
+        Send a batch of queued requests.
+
+        `bazuka wallet send` takes a single recipient and transactions of a
+        wallet must not overlap, so a batch is sent one by one. Repeated
+        addresses in a batch are stopped by the cool down check before
+        reaching the node.
+        """
+        for ticket in tickets:
+            try:
+                self._dispatcher.finish(
+                    ticket, True, self.send(ticket.to, ticket.amount))
+            except Exception as e:  # pylint: disable=W0703
+                self._dispatcher.finish(ticket, False, str(e))
+
+    def submit(self, to, amount):
+        """
+        Queue a faucet request.
+
+        Args:
+            to (str): Address to send to.
+            amount (float): Amount to send.
+        Returns:
+            Ticket: Ticket to poll the request status.
+        Raises:
+            FaucetDurationError: If address is cooling down.
+        """
+        t = MPNWallet(to)
+        self._check(t)
+        return self._dispatcher.submit(str(self._wallet), t, amount)
+
+    def ticket(self, ticket_id):
+        """Get a faucet request ticket."""
+        return self._dispatcher.get(ticket_id)
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Store module
+
+Indexed persistent store of faucet claims.
+"""
+# pylint: disable=C0103
+
+import json as _json
+import sqlite3 as _sqlite3
+import threading as _threading
+from pathlib import Path as _Path
+from datetime import datetime as _dt
+from time import time as _time
+from .Core import validate_keys as _validate_keys
+
+PENDING = 'pending'
+CONFIRMED = 'confirmed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    wallet TEXT NOT NULL,
+    address TEXT NOT NULL,
+    claimed_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'confirmed',
+    PRIMARY KEY (wallet, address)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS claims_wallet_claimed_at
+    ON claims (wallet, claimed_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class FaucetStore:
+    """
+    Faucet claim history of a paying wallet in a SQLite database in WAL mode.
+
+    Cooldown lookups use the primary key index, every send writes a single
+    row and expiry deletes a range of the `claimed_at` index. Claims are
+    kept per paying wallet, so faucets with different cool downs sharing
+    the database never expire or block each other's claims.
+
+    The database is shared by all processes on the host. `claim` checks the
+    cool down and records a pending claim in one write transaction, so an
+    address is paid once however many workers serve the faucet. A pending
+    claim blocks the address like a confirmed one until it is released.
+
+    Claims of a database written before claims had a wallet are assigned to
+    the wallet of the first store opening it.
+
+    Args:
+        file (str, Path): Database file.
+        wallet (str): Address of the paying wallet.
+    """
+
+    def __init__(self, file='~/.faucet.db', wallet=''):
+        self._file = _Path(file).expanduser()
+        self._wallet = str(wallet)
+        self._local = _threading.local()
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            cols = [r[1] for r in db.execute("PRAGMA table_info(claims)")]
+            legacy = len(cols) > 0 and 'wallet' not in cols
+            if legacy:
+                db.execute("ALTER TABLE claims RENAME TO claims_v1")
+                db.execute("DROP INDEX IF EXISTS claims_claimed_at")
+            for statement in _SCHEMA.split(';'):
+                if statement.strip():
+                    db.execute(statement)
+            if legacy:
+                status = 'status' if 'status' in cols else f"'{CONFIRMED}'"
+                db.execute("INSERT INTO claims (wallet, address, claimed_at, "
+                           f"status) SELECT ?, address, claimed_at, {status} "
+                           "FROM claims_v1", (self._wallet,))
+                db.execute("DROP TABLE claims_v1")
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+
+    def __repr__(self):
+        return str(self.items())
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM claims WHERE wallet = ?",
+                                (self._wallet,)).fetchone()[0]
+
+    def __contains__(self, address):
+        return self.last_claim(address) is not None
+
+    @property
+    def file(self):
+        """Get database file."""
+        return self._file
+
+    @property
+    def wallet(self):
+        """Get paying wallet."""
+        return self._wallet
+
+    @property
+    def _db(self):
+        """Get connection of the current thread."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = _sqlite3.connect(str(self._file), timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def last_claim(self, address):
+        """
+        Get last claim time of an address.
+
+        Args:
+            address (str): Wallet address.
+        Returns:
+            datetime: Last claim time. None if address never claimed.
+        """
+        row = self._db.execute(
+            "SELECT claimed_at FROM claims WHERE wallet = ? AND address = ?",
+            (self._wallet, str(address))).fetchone()
+        return None if row is None else _dt.fromtimestamp(row[0])
+
+    def blocked(self, address, cool_down_sec):
+        """
+        Check if an address is cooling down.
+
+        Pending and confirmed claims block the address for the whole cool
+        down. `claim` uses the same rule.
+
+        Args:
+            address (str): Wallet address.
+            cool_down_sec (float): Cool down period in seconds.
+        Returns:
+            datetime: Time of the claim blocking the address. None if the
+                address can claim.
+        """
+        last = self.last_claim(address)
+        if last is not None and _time() - last.timestamp() < cool_down_sec:
+            return last
+        return None
+
+    def add(self, address, when=None):
+        """
+        Record a claim.
+
+        Args:
+            address (str): Wallet address.
+            when (datetime): Claim time. Default is now.
+        """
+        ts = _time() if when is None else when.timestamp()
+        with self._db as db:
+            db.execute("INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?)",
+                       (self._wallet, str(address), ts, CONFIRMED))
+
+    def claim(self, address, cool_down_sec):
+        """
+        Check cool down and claim an address atomically.
+
+        The write lock of the database is taken before the check, so
+        concurrent claims of an address from any process are serialized and
+        only one succeeds. The claim stays pending until it is confirmed or
+        released, and blocks the address for the whole cool down as long as
+        it is pending.
+
+        Args:
+            address (str): Wallet address.
+            cool_down_sec (float): Cool down period in seconds.
+        Returns:
+            datetime: Time of the claim blocking the address. None if the
+                address was claimed.
+        """
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            last = self.blocked(address, cool_down_sec)
+            if last is not None:
+                db.rollback()
+                return last
+            db.execute("INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?)",
+                       (self._wallet, str(address), _time(), PENDING))
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+        return None
+
+    def confirm(self, address):
+        """
+        Confirm a pending claim after a successful payout.
+
+        The cool down starts at confirmation.
+
+        Args:
+            address (str): Wallet address.
+        """
+        with self._db as db:
+            db.execute("UPDATE claims SET claimed_at = ?, status = ? "
+                       "WHERE wallet = ? AND address = ? AND status = ?",
+                       (_time(), CONFIRMED, self._wallet, str(address),
+                        PENDING))
+
+    def release(self, address):
+        """
+        Drop a pending claim after a failed payout.
+
+        Claims of payouts with an unknown outcome are released by hand once
+        the payout is known to have failed.
+
+        Args:
+            address (str): Wallet address.
+        """
+        with self._db as db:
+            db.execute("DELETE FROM claims WHERE wallet = ? AND address = ? "
+                       "AND status = ?", (self._wallet, str(address), PENDING))
+
+    def expire(self, cool_down_sec):
+        """
+        Delete claims older than the cool down period.
+
+        Args:
+            cool_down_sec (float): Cool down period in seconds.
+        Returns:
+            int: Number of deleted claims.
+        """
+        with self._db as db:
+            return db.execute(
+                "DELETE FROM claims WHERE wallet = ? AND claimed_at < ?",
+                (self._wallet, _time() - cool_down_sec)).rowcount
+
+    def items(self):
+        """
+        Get all claims.
+
+        Returns:
+            dict: Claim times by address.
+        """
+        return {k: _dt.fromtimestamp(v) for k, v in self._db.execute(
+            "SELECT address, claimed_at FROM claims WHERE wallet = ? "
+            "ORDER BY claimed_at", (self._wallet,))}
+
+    def import_json(self, file):
+        """
+        Import a JSON faucet history once.
+
+        Claims are imported for the wallet of the store. Invalid addresses
+        are skipped. The JSON file is left untouched and is not imported
+        again.
+
+        Args:
+            file (str, Path): JSON file of {address: isoformat time}.
+        Returns:
+            int: Number of imported claims.
+        """
+        file = _Path(file).expanduser()
+        if not file.exists():
+            return 0
+        key = f'imported:{file.resolve()}'
+        db = self._db
+        # Check and mark in one write transaction, so concurrent workers
+        # import the file once.
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if db.execute("SELECT 1 FROM meta WHERE key = ?",
+                          (key,)).fetchone():
+                db.rollback()
+                return 0
+            with file.open('r') as f:
+                hist = _json.load(f)
+            rows = []
+            for (k, v), err in zip(hist.items(), _validate_keys(hist, 'z')):
+                try:
+                    if err == '':
+                        rows.append((self._wallet, k.lower(),
+                                     _dt.fromisoformat(v).timestamp()))
+                except (TypeError, ValueError):
+                    continue
+            db.executemany(
+                "INSERT INTO claims (wallet, address, claimed_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (wallet, address) "
+                "DO UPDATE SET claimed_at = MAX(claimed_at, excluded.claimed_at)",
+                rows)
+            db.execute("INSERT OR IGNORE INTO meta VALUES (?, ?)",
+                       (key, _dt.now().isoformat()))
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+        return len(rows)
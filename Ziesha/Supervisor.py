@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Supervisor module
+
+Non-blocking supervision of long running tool processes.
+"""
+# pylint: disable=C0103
+
+import re as _re
+import queue as _queue
+import asyncio as _asyncio
+import threading as _threading
+from collections import deque as _deque
+from time import time as _time
+
+READ_SIZE = 65536  # bytes
+MAX_LINE = 65536  # bytes, longer lines are split
+STOP_TIMEOUT = 10  # seconds
+
+PATTERNS = {
+    'height': _re.compile(r'height\D{0,20}?(\d+)', _re.I),
+    'peers': _re.compile(r'(?:peers?\D{0,5}?(\d+)|(\d+)\s+peers?)', _re.I),
+    'sync': _re.compile(r'sync\w*\D*?(\d+(?:\.\d+)?)\s*%', _re.I)}
+
+
+class NodeEvent:
+    """
+    Event parsed from node output.
+
+    Args:
+        kind (str): 'line', 'height', 'peers', 'sync' or 'exit'.
+        value (object): Parsed value.
+        line (str): Output line of the event.
+    """
+
+    def __init__(self, kind, value=None, line=''):
+        self.kind = kind
+        self.value = value
+        self.line = line
+        self.time = _time()
+
+    def __repr__(self):
+        return f"NodeEvent({self.kind}, {self.value!r})"
+
+
+def parse(line):
+    """
+    Parse known values of a node output line.
+
+    Args:
+        line (str): Output line.
+    Returns:
+        list: NodeEvent objects found in the line.
+    """
+    events = []
+    for kind, pattern in PATTERNS.items():
+        m = pattern.search(line)
+        if m is not None:
+            value = next(g for g in m.groups() if g is not None)
+            value = float(value) if kind == 'sync' else int(value)
+            events.append(NodeEvent(kind, value, line))
+    return events
+
+
+class Supervisor:
+    """
+    Run a process in the background and stream its output.
+
+    Output is read by an asyncio loop in a daemon thread. The last
+    `buffer_size` lines are kept in a ring buffer and parsed events are
+    published to subscriber queues.
+
+    Args:
+        argv (list): Command and its arguments.
+        buffer_size (int): Number of output lines to keep.
+    """
+
+    def __init__(self, argv, buffer_size=1000):
+        self.argv = [str(a) for a in argv]
+        self.returncode = None
+        self._lines = _deque(maxlen=buffer_size)
+        self._state = {}
+        self._subscribers = []
+        self._lock = _threading.Lock()
+        self._loop = None
+        self._proc = None
+        self._thread = None
+
+    def __repr__(self):
+        status = 'running' if self.running else f'exited {self.returncode}'
+        return f"Supervisor({' '.join(self.argv)}, {status})"
+
+    @property
+    def running(self):
+        """Check if process is running."""
+        return self._thread is not None and self._thread.is_alive() and \
+            self.returncode is None
+
+    @property
+    def lines(self):
+        """Get last output lines."""
+        return list(self._lines)
+
+    @property
+    def state(self):
+        """Get last parsed value of every event kind."""
+        return dict(self._state)
+
+    def subscribe(self, maxsize=1000):
+        """
+        Subscribe to events.
+
+        Events are dropped for a subscriber whose queue is full.
+
+        Args:
+            maxsize (int): Queue size.
+        Returns:
+            Queue: Queue of NodeEvent objects.
+        """
+        q = _queue.Queue(maxsize)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        """Unsubscribe a queue."""
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def _publish(self, event):
+        """Publish an event to subscribers."""
+        if event.kind not in ('line', 'exit'):
+            self._state[event.kind] = event.value
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except _queue.Full:
+                pass
+
+    def _emit(self, raw):
+        """Keep and publish an output line."""
+        line = raw.decode('utf-8', 'replace').rstrip()
+        self._lines.append(line)
+        self._publish(NodeEvent('line', line, line))
+        for event in parse(line):
+            self._publish(event)
+
+    async def _read(self):
+        """Read process output until end of file."""
+        buf = b''
+        while True:
+            chunk = await self._proc.stdout.read(READ_SIZE)
+            if chunk == b'':
+                break
+            *lines, buf = (buf + chunk).split(b'\n')
+            for raw in lines:
+                while len(raw) > MAX_LINE:
+                    self._emit(raw[:MAX_LINE])
+                    raw = raw[MAX_LINE:]
+                self._emit(raw)
+            while len(buf) > MAX_LINE:
+                self._emit(buf[:MAX_LINE])
+                buf = buf[MAX_LINE:]
+        if buf:
+            self._emit(buf)
+
+    async def _run(self):
+        """Read process output until it exits."""
+        self._proc = await _asyncio.create_subprocess_exec(
+            *self.argv, stdout=_asyncio.subprocess.PIPE,
+            stderr=_asyncio.subprocess.STDOUT,
+            stdin=_asyncio.subprocess.DEVNULL)
+        try:
+            await self._read()
+        except Exception as e:  # pylint: disable=W0703
+            # Nobody would read the pipe any more, so stop the process.
+            self._lines.append(f"Output reader failed: {e!r}")
+            try:
+                self._proc.terminate()
+                await _asyncio.wait_for(self._proc.wait(), STOP_TIMEOUT)
+            except ProcessLookupError:
+                pass
+            except _asyncio.TimeoutError:
+                self._proc.kill()
+        self.returncode = await self._proc.wait()
+        self._publish(NodeEvent('exit', self.returncode))
+
+    def _main(self):
+        """Thread entry point."""
+        self._loop = _asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        except Exception as e:  # pylint: disable=W0703
+            self._lines.append(str(e))
+            self._publish(NodeEvent('exit', None, str(e)))
+        finally:
+            self._loop.close()
+
+    def start(self):
+        """Start the process without blocking."""
+        if self.running:
+            return self
+        self.returncode = None
+        self._thread = _threading.Thread(target=self._main, daemon=True,
+                                         name=f'supervisor-{self.argv[0]}')
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        Terminate the process.
+
+        Args:
+            timeout (float): Seconds to wait for the process to exit.
+        Returns:
+            bool: True if process exited.
+        """
+        if self.running and self._proc is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._proc.terminate)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.running
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Tools module
+
+Cached metadata of installed Ziesha tools.
+"""
+# pylint: disable=C0103
+
+import os as _os
+import threading as _threading
+from shutil import which as _which
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from .Core import _Singleton, run_cmd
+
+TOOLS = ['bazuka', 'zoro', 'uzi-pool', 'uzi-miner']
+
+
+class ToolInfo:
+    """
+    Metadata of an installed tool.
+
+    Args:
+        name (str): Tool name.
+        path (str): Absolute path of the binary. None if not installed.
+        output (str): Output of `<tool> --version`.
+        stamp (tuple): (path, inode, mtime) of the probed binary.
+    """
+
+    def __init__(self, name, path=None, output='', stamp=None):
+        self.name = name
+        self.path = path
+        self.output = output
+        self.stamp = stamp
+
+    def __repr__(self):
+        return f"{self.name} ({self.path}): v{self.version}"
+
+    @property
+    def is_installed(self):
+        """Check if tool is installed."""
+        return self.path is not None
+
+    @property
+    def version(self):
+        """Get version number."""
+        ret = self.output
+        if self.name != 'bazuka':
+            ret = ret.split('\n')[-1]
+        return ret.split(' ')[-1]
+
+
+def _stamp(path):
+    """Get (path, inode, mtime) of a binary or None if it is missing."""
+    try:
+        st = _os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (path, st.st_ino, st.st_mtime_ns)
+
+
+class ToolRegistry(metaclass=_Singleton):
+    """
+    Registry of Ziesha tool metadata.
+
+    `which` and `--version` results are probed once and kept until the
+    binary on disk changes (path, inode or mtime).
+    """
+
+    def __init__(self):
+        self._lock = _threading.Lock()
+        self._info = {}
+        self.refresh()
+
+    def __repr__(self):
+        return '\n'.join(repr(i) for i in self._info.values())
+
+    @staticmethod
+    def _probe(name):
+        """Probe a tool."""
+        path = _which(name)
+        if path is None:
+            return ToolInfo(name)
+        path = _os.path.realpath(path)
+        stamp = _stamp(path)
+        return ToolInfo(name, path, run_cmd(path, "--version"), stamp)
+
+    def _is_stale(self, info):
+        """Check if cached metadata no longer matches the binary."""
+        if info.path is None:
+            return _which(info.name) is not None
+        return _stamp(info.path) != info.stamp or \
+            _os.path.realpath(_which(info.name) or '') != info.path
+
+    def refresh(self, names=None):
+        """
+        Probe tools in parallel.
+
+        Args:
+            names (list): Tools to probe. Default is all tools.
+        """
+        names = TOOLS if names is None else names
+        with _ThreadPoolExecutor(max_workers=len(names) or 1) as ex:
+            infos = list(ex.map(self._probe, names))
+        with self._lock:
+            self._info.update({i.name: i for i in infos})
+
+    def get(self, name):
+        """
+        Get tool metadata.
+
+        Args:
+            name (str): Tool name.
+        Returns:
+            ToolInfo: Cached metadata, re-probed if the binary changed.
+        Raises:
+            ValueError: If tool is not a Ziesha tool.
+        """
+        if name not in TOOLS:
+            raise ValueError(f"'name' must be one of {TOOLS}")
+        info = self._info.get(name)
+        if info is None or self._is_stale(info):
+            self.refresh([name])
+            info = self._info[name]
+        return info
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+ZiePy Trace module
+
+Opt-in span profiler.
+
+Set `ZIESHA_TRACE=1` to enable. Every `trace()` block, e.g. one page rerun,
+is written to `ZIESHA_TRACE_DIR` as Chrome trace JSON (open in
+chrome://tracing or Perfetto) and as collapsed stacks for flamegraph tools.
+When disabled, `traced` returns the function itself and `span` returns a
+shared no-op context manager.
+"""
+# pylint: disable=C0103
+
+import os as _os
+import json as _json
+import threading as _threading
+from itertools import count as _count
+from contextlib import contextmanager as _contextmanager
+from contextlib import nullcontext as _nullcontext
+from functools import wraps as _wraps
+from pathlib import Path as _Path
+from time import perf_counter as _perf_counter
+from time import strftime as _strftime
+
+ENABLED = _os.environ.get('ZIESHA_TRACE', '') not in ('', '0')
+TRACE_DIR = _Path(_os.environ.get(
+    'ZIESHA_TRACE_DIR', '~/.cache/ziesha-pool/traces')).expanduser()
+
+_NULL = _nullcontext()
+_local = _threading.local()
+_lock = _threading.Lock()
+_recording = None
+_seq = _count(1)
+
+
+class _Recording:
+    """Spans collected during a `trace()` block."""
+
+    def __init__(self, name):
+        self.name = name
+        self.origin = _perf_counter()
+        self.events = []
+        self.stacks = {}
+
+    def add(self, path, start, duration, self_time, args):
+        """Add a finished span."""
+        with _lock:
+            self.events.append({
+                'name': path[-1], 'ph': 'X', 'pid': _os.getpid(),
+                'tid': _threading.get_ident(),
+                'ts': round((start - self.origin) * 1e6, 1),
+                'dur': round(duration * 1e6, 1), 'args': args})
+            key = ';'.join(path)
+            self.stacks[key] = self.stacks.get(key, 0) + self_time
+
+    def dump(self, directory=TRACE_DIR):
+        """
+        Write the recording to files.
+
+        Returns:
+            tuple: (Chrome trace file, collapsed stacks file).
+        """
+        directory = _Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.name}-{_strftime('%Y%m%d-%H%M%S')}-" + \
+            f"{_os.getpid()}-{next(_seq)}"
+        with _lock:
+            events, stacks = list(self.events), dict(self.stacks)
+        json_file = directory / f"{stem}.json"
+        json_file.write_text(_json.dumps({'traceEvents': events}))
+        folded_file = directory / f"{stem}.folded"
+        folded_file.write_text(''.join(
+            f"{k} {max(round(v * 1e6), 1)}\n"
+            for k, v in sorted(stacks.items())))
+        return json_file, folded_file
+
+
+@_contextmanager
+def _span(name, args):
+    """Record a span on the stack of the current thread."""
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    frame = [name, 0.0]
+    stack.append(frame)
+    start = _perf_counter()
+    try:
+        yield
+    finally:
+        duration = _perf_counter() - start
+        path = [f[0] for f in stack]
+        stack.pop()
+        if stack:
+            stack[-1][1] += duration
+        rec = _recording
+        if rec is not None:
+            rec.add(path, start, duration, duration - frame[1], args)
+
+
+def span(name, **args):
+    """
+    Time a block as a span.
+
+    Args:
+        name (str): Span name.
+        **args: Values shown with the span in the trace viewer.
+    Returns:
+        Context manager.
+    """
+    if not ENABLED:
+        return _NULL
+    return _span(name, {k: str(v) for k, v in args.items()})
+
+
+def traced(func=None, name=None):
+    """
+    Decorate a function to be timed as a span.
+
+    Can be used as `@traced` or `@traced(name='...')`. Functions are
+    returned unchanged when tracing is disabled.
+
+    Args:
+        func (callable): Function to trace.
+        name (str): Span name. Default is the qualified function name.
+    """
+    if func is None:
+        return lambda f: traced(f, name)
+    if not ENABLED:
+        return func
+    span_name = name or func.__qualname__
+
+    @_wraps(func)
+    def wrapper(*args, **kwargs):
+        with _span(span_name, {}):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@_contextmanager
+def trace(name, directory=TRACE_DIR):
+    """
+    Record all spans of all threads during a block and write them to files.
+
+    Blocks started while another one is recording, in any thread, are
+    recorded as plain spans of the running recording.
+
+    Args:
+        name (str): Name of the recording and its root span.
+        directory (str, Path): Output directory.
+    """
+    global _recording  # pylint: disable=W0603
+    if not ENABLED:
+        yield None
+        return
+    with _lock:
+        rec = _Recording(name) if _recording is None else None
+        if rec is not None:
+            _recording = rec
+    try:
+        with _span(name, {}):
+            yield rec
+    finally:
+        if rec is not None:
+            with _lock:
+                _recording = None
+            try:
+                rec.dump(directory)
+            except OSError:
+                pass
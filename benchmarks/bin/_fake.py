@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Fake Tools Module
+
+Stand-ins for bazuka, zoro, uzi-pool and uzi-miner used by the benchmarks.
+Every call sleeps `FAKE_LATENCY` seconds (or `FAKE_<TOOL>_LATENCY`, e.g.
+`FAKE_BAZUKA_LATENCY`) before answering like the real tool would.
+`bazuka wallet send` answers `FAKE_SEND_RESPONSE`, exits with
+`FAKE_SEND_EXIT` and appends its arguments to the file `FAKE_SEND_LOG`.
+"""
+# pylint: disable=C0103
+import os as _os
+import sys as _sys
+from hashlib import sha256 as _sha256
+from time import sleep as _sleep
+
+VERSIONS = {'bazuka': '0.3.1', 'zoro': '0.1.2', 'uzi-pool': '0.1.2',
+            'uzi-miner': '0.1.2'}
+MAIN_ADDRESS = '0xa5875f8e8a4121097630c9ecab1475ded4a45a6ec98402a57c592f68910648c4'
+MPN_ADDRESS = 'z24a4a451aa41c593903f550078720d0985be2cb453d2a445927298d2e21c74778'
+
+
+def _env(tool, name, default):
+    """Get a setting of a tool from the environment."""
+    key = tool.upper().replace('-', '_')
+    return _os.environ.get(f'FAKE_{key}_{name}',
+                           _os.environ.get(f'FAKE_{name}', default))
+
+
+def address(i, prefix='z'):
+    """Get a deterministic fake address."""
+    return prefix + _sha256(str(i).encode()).hexdigest()
+
+
+def wallet_info(accounts=0):
+    """
+    Get `bazuka wallet info` output.
+
+    Args:
+        accounts (int): Number of extra MPN accounts.
+    """
+    sections = [f"Main chain public-key:\n\tNonce: 3\nAddress: {MAIN_ADDRESS}\n"
+                "#Ziesha: 12500.5ℤ",
+                f"MPN account:\n\tNonce: 1\nAddress: {MPN_ADDRESS}\n"
+                "#Ziesha: 3250.25ℤ\n#Token(abc): 10ℤ"]
+    sections += [f"MPN account:\n\tNonce: {i}\nAddress: {address(i)}\n"
+                 f"#Ziesha: {i}.5ℤ" for i in range(accounts)]
+    return '\n\n'.join(sections)
+
+
+def _forever(lines=()):
+    """Run like a long-lived tool process."""
+    i = 0
+    while True:
+        i += 1
+        for line in lines:
+            print(line.format(i=i), flush=True)
+        _sleep(1)
+
+
+def bazuka(args):
+    """Fake bazuka."""
+    cmd = args[:2]
+    if cmd == ['node', 'start']:
+        _forever(("[INFO] Height advanced to {i}, Peers: 8",))
+    elif cmd == ['node', 'status']:
+        print("Height: 1000\nOutdated: false\nPeers: 8")
+    elif cmd == ['wallet', 'info']:
+        print(wallet_info(int(_env('bazuka', 'WALLET_ACCOUNTS', 0))))
+    elif cmd == ['wallet', 'send']:
+        log = _env('bazuka', 'SEND_LOG', '')
+        if log:
+            with open(log, 'a', encoding='utf-8') as f:
+                f.write(' '.join(args[2:]) + '\n')
+        print(_env('bazuka', 'SEND_RESPONSE', 'PostMpnTransactionResponse'))
+        return int(_env('bazuka', 'SEND_EXIT', 0))
+    elif args[:1] == ['wallet']:
+        print("Done")
+    else:
+        return 1
+    return 0
+
+
+def zoro(args):
+    """Fake zoro."""
+    if args[:1] in (['prove'], ['pack']):
+        _forever()
+    return 1
+
+
+def uzi_pool(args):
+    """Fake uzi-pool."""
+    if '--node' in args:
+        _forever()
+    return 1
+
+
+def uzi_miner(args):
+    """Fake uzi-miner."""
+    if '--node' in args:
+        _forever()
+    return 1
+
+
+TOOLS = {'bazuka': bazuka, 'zoro': zoro, 'uzi-pool': uzi_pool,
+         'uzi-miner': uzi_miner}
+
+
+def main(tool):
+    """Run a fake tool."""
+    args = _sys.argv[1:]
+    _sleep(float(_env(tool, 'LATENCY', 0)))
+    if args == ['--version']:
+        if tool != 'bazuka':
+            print(f"{tool} banner")
+        print(f"{tool} {VERSIONS[tool]}")
+        return 0
+    return TOOLS[tool](args)
@@ -0,0 +1,122 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Load Generator Module
+
+Registration rush through the Miners module against the uzi-pool stand-in
+or a running uzi-pool.
+
+    python benchmarks/loadgen.py --registrations 2000 --concurrency 8 16 32
+    python benchmarks/loadgen.py --pool-port 8766   # running uzi-pool
+"""
+# pylint: disable=C0103,C0415
+import argparse as _argparse
+import os as _os
+import sys as _sys
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from hashlib import sha256 as _sha256
+from itertools import count as _count
+from pathlib import Path as _Path
+from time import perf_counter as _perf_counter
+
+HERE = _Path(__file__).resolve().parent
+# Appended, so the repo's logging.py does not shadow the stdlib one.
+_sys.path.append(str(HERE.parent))
+_os.environ.setdefault('POOL_PUBLIC_IP', '127.0.0.1')
+
+_seq = _count()
+
+
+def _wallet():
+    """Get a new fake MPN address."""
+    return 'z' + _sha256(f'rush-{_os.getpid()}-{next(_seq)}'.encode()).hexdigest()
+
+
+def _percentile(values, p):
+    """Get a percentile of sorted values."""
+    return values[min(int(len(values) * p / 100), len(values) - 1)]
+
+
+def rush(registrations, concurrency):
+    """
+    Register new wallets concurrently through `Miners.register`.
+
+    Args:
+        registrations (int): Number of registrations.
+        concurrency (int): Number of concurrent callers.
+    Returns:
+        dict: Throughput in registrations per second, latency percentiles
+            in seconds and number of errors.
+    """
+    import Miners
+    from Ziesha.Exceptions import PoolError
+
+    def register(wallet):
+        start = _perf_counter()
+        try:
+            Miners.register(wallet)
+            ok = True
+        except (ValueError, PoolError):
+            ok = False
+        return _perf_counter() - start, ok
+
+    wallets = [_wallet() for _ in range(registrations)]
+    start = _perf_counter()
+    with _ThreadPoolExecutor(concurrency) as ex:
+        done = list(ex.map(register, wallets))
+    elapsed = _perf_counter() - start
+    times = sorted(t for t, _ in done)
+    return {'registrations': registrations, 'concurrency': concurrency,
+            'throughput': registrations / elapsed, 'seconds': elapsed,
+            'p50': _percentile(times, 50), 'p99': _percentile(times, 99),
+            'max': times[-1], 'errors': sum(not ok for _, ok in done)}
+
+
+def main():
+    """Entry point."""
+    parser = _argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--registrations', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=[1, 8, 32])
+    parser.add_argument('--miners', type=int, default=1000,
+                        help='miners registered to the stand-in at start')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds every stand-in request sleeps')
+    parser.add_argument('--pool-url', default=None,
+                        help='url of a running uzi-pool instead of the stand-in')
+    parser.add_argument('--pool-port', type=int, default=None,
+                        help='port of a running uzi-pool instead of the stand-in')
+    parser.add_argument('--save', action='store_true',
+                        help='write results to benchmarks/results')
+    args = parser.parse_args()
+
+    import Miners
+    server = None
+    if args.pool_url is None and args.pool_port is None:
+        from pool_server import PoolServer
+        server = PoolServer(0, args.miners, args.latency).start()
+        url, port = server.url, server.port
+    else:
+        url, port = args.pool_url or Miners.URL, args.pool_port or Miners.PORT
+    print(f"uzi-pool at {url}:{port}")
+
+    results = {}
+    for c in args.concurrency:
+        Miners.configure(url, port, pool_size=max(c, 10))
+        res = rush(args.registrations, c)
+        results[f"register[concurrency={c}]"] = res
+        print(f"concurrency {c:>4}: {res['throughput']:>9.1f} reg/s, "
+              f"p50 {res['p50'] * 1e3:.2f} ms, p99 {res['p99'] * 1e3:.2f} ms, "
+              f"max {res['max'] * 1e3:.2f} ms, errors {res['errors']}",
+              flush=True)
+    if server is not None:
+        server.shutdown()
+    if args.save:
+        from run import save
+        print(f"Saved {save(results, args.latency, prefix='loadgen-')}")
+
+
+if __name__ == '__main__':
+    main()
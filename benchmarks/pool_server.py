@@ -0,0 +1,134 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Pool Server Module
+
+Local stand-in of the uzi-pool HTTP API with `get-miners` and `add-miner`.
+
+    python benchmarks/pool_server.py --port 8766 --miners 10000 --latency 0.01
+"""
+# pylint: disable=C0103
+import argparse as _argparse
+import json as _json
+import threading as _threading
+from hashlib import sha256 as _sha256
+from http.server import BaseHTTPRequestHandler as _BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer as _ThreadingHTTPServer
+from time import sleep as _sleep
+
+PORT = 8766
+
+
+def _address(i):
+    """Get a deterministic fake MPN address."""
+    return 'z' + _sha256(f'miner-{i}'.encode()).hexdigest()
+
+
+class PoolServer(_ThreadingHTTPServer):
+    """
+    uzi-pool stand-in.
+
+    Args:
+        port (int): Port to listen on. 0 picks a free port.
+        miners (int): Number of miners registered at start.
+        latency (float): Seconds every request sleeps before answering.
+        host (str): Address to listen on.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, port=PORT, miners=0, latency=0.0, host='127.0.0.1'):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.lock = _threading.Lock()
+        self.miners = {_sha256(_address(i).encode()).hexdigest()[:32]:
+                       _address(i) for i in range(miners)}
+        self.requests = 0
+
+    @property
+    def url(self):
+        """Get base url without port."""
+        return f"http://{self.server_address[0]}"
+
+    @property
+    def port(self):
+        """Get listening port."""
+        return self.server_address[1]
+
+    def get_miners(self, _body):
+        """Get wallets by token."""
+        with self.lock:
+            return dict(self.miners)
+
+    def add_miner(self, body):
+        """Register a wallet and get its token."""
+        wallet = _json.loads(body)['mpn_addr']
+        token = _sha256(wallet.encode()).hexdigest()[:32]
+        with self.lock:
+            self.miners[token] = wallet
+        return {'miner_token': token}
+
+    def start(self):
+        """Serve in a background thread."""
+        _threading.Thread(target=self.serve_forever, name='pool-server',
+                          daemon=True).start()
+        return self
+
+
+class _Handler(_BaseHTTPRequestHandler):
+    """Route uzi-pool API calls."""
+
+    protocol_version = 'HTTP/1.1'
+    # Buffer replies so headers and body leave in one segment, avoiding
+    # Nagle/delayed ACK stalls on kept-alive connections.
+    wbufsize = -1
+    routes = {'/get-miners': PoolServer.get_miners,
+              '/add-miner': PoolServer.add_miner}
+
+    def do_POST(self):  # pylint: disable=C0116
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        route = self.routes.get(self.path)
+        if self.server.latency > 0:
+            _sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+        if route is None:
+            data, status = b'Not found', 404
+        else:
+            try:
+                data, status = _json.dumps(route(self.server, body)).encode(), 200
+            except (ValueError, TypeError, KeyError):
+                data, status = b'Bad request', 400
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        pass
+
+
+def main():
+    """Entry point."""
+    parser = _argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--miners', type=int, default=0,
+                        help='number of miners registered at start')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds every request sleeps')
+    args = parser.parse_args()
+    server = PoolServer(args.port, args.miners, args.latency)
+    print(f"uzi-pool stand-in on {server.url}:{server.port} "
+          f"with {len(server.miners)} miners", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Benchmarks Module
+
+Run hot paths against the fake tools in `benchmarks/bin` and store the
+timings in `benchmarks/results` so runs of different versions can be
+compared.
+
+    python benchmarks/run.py [--latency 0.05] [--filter faucet]
+    python benchmarks/run.py --compare benchmarks/results/<older>.json
+"""
+# pylint: disable=C0103,C0415
+import argparse as _argparse
+import json as _json
+import os as _os
+import platform as _platform
+import statistics as _statistics
+import subprocess as _subp
+import sys as _sys
+import tempfile as _tempfile
+from datetime import datetime as _dt
+from pathlib import Path as _Path
+from time import perf_counter as _perf_counter
+from time import sleep as _sleep
+
+HERE = _Path(__file__).resolve().parent
+ROOT = HERE.parent
+BIN = HERE / 'bin'
+RESULTS = HERE / 'results'
+MIN_TIME = 0.5  # seconds per benchmark
+MIN_RUNS = 5
+MAX_RUNS = 100000
+
+WALLET_ACCOUNTS = (0, 100, 1000)
+FAUCET_CLAIMS = (0, 10000, 100000)
+POOL_MINERS = (100, 10000, 100000)
+
+
+def _setup_env(latency, home):
+    """Put fake tools on PATH and isolate the home directory."""
+    _os.environ['PATH'] = f"{BIN}{_os.pathsep}{_os.environ.get('PATH', '')}"
+    _os.environ['HOME'] = str(home)
+    _os.environ['FAKE_LATENCY'] = str(latency)
+    _os.environ.setdefault('POOL_PUBLIC_IP', '127.0.0.1')
+    # Appended, so the repo's logging.py does not shadow the stdlib one.
+    _sys.path.append(str(ROOT))
+    _sys.path.append(str(BIN))
+
+
+def _commit():
+    """Get short commit hash of the tree, marked if it has changes."""
+    try:
+        rev = _subp.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                        capture_output=True, text=True, check=True).stdout
+        dirty = _subp.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                          cwd=ROOT, capture_output=True, text=True,
+                          check=True).stdout
+    except (OSError, _subp.CalledProcessError):
+        return 'unknown'
+    return rev.strip() + ('-dirty' if dirty.strip() else '')
+
+
+class Runner:
+    """
+    Time benchmark functions.
+
+    Args:
+        pattern (str): Only run benchmarks whose name contains this.
+        min_time (float): Minimum total time of a benchmark in seconds.
+    """
+
+    def __init__(self, pattern=None, min_time=MIN_TIME):
+        self.pattern = pattern
+        self.min_time = min_time
+        self.results = {}
+
+    def selected(self, name):
+        """Check if a benchmark is selected."""
+        return self.pattern is None or self.pattern in name
+
+    def run(self, name, func, setup=None, **params):
+        """
+        Time a function.
+
+        Args:
+            name (str): Benchmark name.
+            func (callable): Function to time.
+            setup (callable): Untimed function called before every run.
+            **params: Parameters of the benchmark, part of its key.
+        """
+        key = name + ''.join(f"[{k}={v}]" for k, v in params.items())
+        if not self.selected(key):
+            return
+        times, total = [], 0.0
+        while (len(times) < MIN_RUNS or total < self.min_time) and \
+                len(times) < MAX_RUNS:
+            if setup is not None:
+                setup()
+            start = _perf_counter()
+            func()
+            t = _perf_counter() - start
+            times.append(t)
+            total += t
+        times.sort()
+        res = {'runs': len(times), 'min': times[0],
+               'median': _statistics.median(times),
+               'mean': total / len(times),
+               'p95': times[min(int(len(times) * 0.95), len(times) - 1)]}
+        self.results[key] = res
+        print(f"{key:<48} {res['median'] * 1e3:>10.3f} ms "
+              f"(min {res['min'] * 1e3:.3f}, p95 {res['p95'] * 1e3:.3f}, "
+              f"n={res['runs']})", flush=True)
+
+
+def bench_wallet(r):
+    """Wallet info parsing and caching."""
+    from Ziesha.Server import Wallet, WalletSnapshot
+    from _fake import wallet_info
+    for n in WALLET_ACCOUNTS:
+        raw = wallet_info(n)
+        r.run('wallet_snapshot_parse', lambda: WalletSnapshot(raw).address,
+              accounts=n)
+    w = Wallet()
+    r.run('wallet_info_cold', lambda: w.info, setup=w.invalidate)
+    r.run('wallet_info_warm', lambda: w.info)
+
+
+def bench_tools(r):
+    """Tool versions and running state."""
+    from Ziesha.Server import Bazuka, ZoroProve
+    from Ziesha.Tools import TOOLS, ToolRegistry
+    from Ziesha.Sampler import ProcessSampler
+    reg = ToolRegistry()
+    r.run('tool_version_cold', lambda: reg.refresh(TOOLS))
+    r.run('tool_version_warm', lambda: Bazuka().version)
+    r.run('is_running_warm', lambda: ZoroProve().is_running)
+    r.run('sampler_sample', ProcessSampler().sample)
+
+
+def bench_footer(r):
+    """Footer rendering."""
+    if not r.selected('footer_content'):
+        return
+    import footer
+    footer.footer_content()
+    r.run('footer_content', footer.footer_content)
+
+
+def _reset(cls):
+    """Drop the instances of a singleton or multiton."""
+    from Ziesha.Core import _Multiton, _Singleton
+    _Singleton._instances.pop(cls, None)
+    for k in [k for k in _Multiton._instances if k[0] is cls]:
+        del _Multiton._instances[k]
+
+
+def bench_faucet(r, home):
+    """Faucet sends with stores of different sizes."""
+    from time import time
+    from Ziesha.Server import Faucet
+    from _fake import address, MPN_ADDRESS
+    for n in FAUCET_CLAIMS:
+        if not r.selected(f'faucet_send[claims={n}]'):
+            continue
+        _os.environ['HOME'] = str(home / f'faucet-{n}')
+        _os.makedirs(_os.environ['HOME'], exist_ok=True)
+        _reset(Faucet)
+        faucet = Faucet(MPN_ADDRESS, COOL_DOWN_SEC=3600)
+        store = faucet._store  # pylint: disable=W0212
+        with store._db as db:  # pylint: disable=W0212
+            db.executemany("INSERT OR REPLACE INTO claims "
+                           "(wallet, address, claimed_at) VALUES (?, ?, ?)",
+                           ((store.wallet, address(i), time())
+                            for i in range(n)))
+        count = iter(range(n, n + MAX_RUNS))
+        r.run('faucet_send', lambda: faucet.send(address(next(count)), 1),
+              claims=n)
+    _os.environ['HOME'] = str(home)
+
+
+def bench_pool_miners(r, home):
+    """Miner list loading at different sizes."""
+    from Ziesha.Server import PoolMiners
+    from _fake import address
+    file = home / '.uzi-pool-miners'
+    for n in POOL_MINERS:
+        if not any(r.selected(f'pool_miners_{k}[miners={n}]')
+                   for k in ('load', 'reload', 'changed_read')):
+            continue
+        file.write_text(_json.dumps([
+            {'token': address(i, ''), 'mpn_addr': {'pub_key': [address(i)]}}
+            for i in range(n)]))
+        _reset(PoolMiners)
+        pm = PoolMiners()
+        r.run('pool_miners_load', pm.load,
+              setup=lambda: setattr(pm, '_miners', {}), miners=n)
+        r.run('pool_miners_reload', pm.load, miners=n)
+
+        def touch():
+            if pm._loader is not None:  # pylint: disable=W0212
+                pm._loader.join()  # pylint: disable=W0212
+            _os.utime(file, ns=(_os.stat(file).st_atime_ns,
+                                _os.stat(file).st_mtime_ns + 1))
+        r.run('pool_miners_changed_read', lambda: pm.miners, setup=touch,
+              miners=n)
+    file.unlink(missing_ok=True)
+
+
+def _start_processes():
+    """Start long-running fake tools for the samplers to find."""
+    cmds = [['bazuka', 'node', 'start'], ['zoro', 'prove'],
+            ['uzi-pool', '--node', '127.0.0.1:8765']]
+    procs = [_subp.Popen(c, stdout=_subp.DEVNULL, stderr=_subp.DEVNULL)
+             for c in cmds]
+    _sleep(0.5)
+    return procs
+
+
+def save(results, latency, prefix=''):
+    """Write results to the results directory."""
+    RESULTS.mkdir(exist_ok=True)
+    commit = _commit()
+    now = _dt.now()
+    doc = {'commit': commit, 'date': now.isoformat(timespec='seconds'),
+           'python': _platform.python_version(),
+           'platform': _platform.platform(), 'latency': latency,
+           'results': results}
+    file = RESULTS / f"{prefix}{now:%Y%m%d-%H%M%S}-{commit}.json"
+    file.write_text(_json.dumps(doc, indent=2, sort_keys=True) + '\n')
+    return file
+
+
+def compare(results, baseline):
+    """Print median times relative to a baseline result file."""
+    base = _json.loads(_Path(baseline).read_text())
+    print(f"\nCompared to {base['commit']} ({base['date']}):")
+    for key, res in results.items():
+        old = base['results'].get(key)
+        if old is None:
+            continue
+        ratio = res['median'] / old['median']
+        print(f"{key:<48} {ratio:>7.2f}x")
+
+
+def main():
+    """Entry point."""
+    parser = _argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='latency of fake tool calls in seconds')
+    parser.add_argument('--filter', default=None,
+                        help='run benchmarks whose name contains this')
+    parser.add_argument('--min-time', type=float, default=MIN_TIME,
+                        help='minimum time per benchmark in seconds')
+    parser.add_argument('--compare', default=None,
+                        help='result file to compare with')
+    parser.add_argument('--no-save', action='store_true',
+                        help='do not write a result file')
+    args = parser.parse_args()
+
+    with _tempfile.TemporaryDirectory(prefix='ziesha-bench-') as tmp:
+        home = _Path(tmp)
+        _setup_env(args.latency, home)
+        procs = _start_processes()
+        r = Runner(args.filter, args.min_time)
+        try:
+            bench_wallet(r)
+            bench_tools(r)
+            bench_footer(r)
+            bench_faucet(r, home)
+            bench_pool_miners(r, home)
+        finally:
+            for p in procs:
+                p.kill()
+                p.wait()
+    if not args.no_save and r.results:
+        print(f"\nSaved {save(r.results, args.latency)}")
+    if args.compare:
+        compare(r.results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,17 @@
 import streamlit as st
-import base64 as _base64
+import threading as _threading
+from time import sleep as _sleep
+from functools import lru_cache as _lru_cache
 from os.path import splitext as _splitext
-from Ziesha.Server import Bazuka, ZoroPack, ZoroProve, UziPool
+from Assets import AssetBundle as _AssetBundle
+from Ziesha.Trace import traced as _traced
 
 
-@st.cache(allow_output_mutation=True)
 def get_base64_of_bin_file(bin_file):
-    with open(bin_file, 'rb') as f:
-        data = f.read()
-    return _base64.b64encode(data).decode()
+    return _AssetBundle().b64(bin_file)
 
 
-@st.cache(allow_output_mutation=True)
+@_lru_cache(maxsize=None)
 def get_img_with_href(local_img_path, target_url, text):
     img_format = _splitext(local_img_path)[-1].replace('.', '')
     bin_str = get_base64_of_bin_file(local_img_path)
@@ -65,22 +65,87 @@ def header():
     """, unsafe_allow_html=True)
 
 
+class _Badges:
+    """
+    Status badge HTML of the footer, refreshed in the background.
+
+    Badges are rendered again only when running state or version of a tool
+    changes. `Ziesha.Server` is imported on the first render, which waits
+    for one refresh. Later pages render the cached HTML.
+
+    Args:
+        tools (tuple): Names of the `Ziesha.Server` tool classes to show.
+        interval (float): Refresh interval in seconds.
+    """
+
+    def __init__(self, tools=('Bazuka', 'ZoroPack', 'ZoroProve'),
+                 interval=2.0):
+        self._tools = tools
+        self._interval = interval
+        self._state = None
+        self._html = ''
+        self._lock = _threading.Lock()
+        self._first = _threading.Lock()
+        self._thread = None
+
+    @_traced
+    def refresh(self):
+        """Render badges if a tool changed."""
+        from Ziesha import Server  # pylint: disable=C0415
+        tools = [getattr(Server, t)() for t in self._tools]
+        state = tuple((t.is_running, t.version) for t in tools)
+        if state != self._state:
+            html = ' | '.join(t.shieldsio_link for t in tools)
+            with self._lock:
+                self._html, self._state = html, state
+
+    def _run(self):
+        """Refresh loop."""
+        while True:
+            try:
+                self.refresh()
+            except Exception:  # pylint: disable=W0703
+                # Keep the badges refreshing whatever a tool lookup raises.
+                pass
+            _sleep(self._interval)
+
+    @property
+    def html(self):
+        """Get badge HTML. Refreshed in this thread while none is cached."""
+        if self._state is None:
+            with self._first:
+                if self._state is None:
+                    try:
+                        self.refresh()
+                    except Exception:  # pylint: disable=W0703
+                        pass
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = _threading.Thread(
+                        target=self._run, name='footer-badges', daemon=True)
+                    self._thread.start()
+        return self._html
+
+
+_badges = _Badges()
+
+
+@_traced
 def footer_content():
-    b, z1, z2 = Bazuka().shieldsio_link, ZoroPack(
-    ).shieldsio_link, ZoroProve().shieldsio_link
+    badges = _badges.html
     return f"""
     <p>
         <font color="#CD6155">Ziesha Pool</font> made with ❤️ by 
         <a href="https://twitter.com/pentafenolin" target="_blank" rel="nofollow noopener noreferrer">@pentafenolin</a>
         <br>
-        {b} | {z1} | {z2}
+        {badges}
     </p>""".replace('\n', '')
 
 
+@_traced
 def footer():
     """Footer function"""
-    b, z1, z2 = Bazuka().shieldsio_link, ZoroPack(
-    ).shieldsio_link, ZoroProve().shieldsio_link
     st.markdown(f"""
     <style>
     a:link , a:visited{{
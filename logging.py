@@ -1,9 +1,10 @@
 import streamlit as st
 # from streamlit.report_thread import REPORT_CONTEXT_ATTR_NAME
-from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
-from threading import current_thread
+from streamlit.runtime.scriptrunner.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME, add_script_run_ctx, get_script_run_ctx)
+from threading import current_thread, Event, Lock, Thread
+from collections import deque
 from contextlib import contextmanager
-from io import StringIO
 import sys
 import logging
 import time
@@ -28,26 +29,81 @@ st.markdown(f'''
 </style>
 ''', unsafe_allow_html=True)
 
+MAX_LINES = 1000  # lines kept on screen
+MAX_FPS = 10  # renders per second
+
+
+class _LineBuffer:
+    """
+    Ring buffer of the last output lines.
+
+    Writes only append to the buffer. The text is joined when rendered,
+    so a stream costs O(lines kept) per frame instead of O(total output).
+    """
+
+    def __init__(self, max_lines=MAX_LINES):
+        self._lines = deque(maxlen=max_lines)
+        self._partial = ''
+        self._lock = Lock()
+        self.dirty = False
+
+    def write(self, b):
+        with self._lock:
+            lines = (self._partial + b).split('\n')
+            self._partial = lines.pop()
+            self._lines.extend(lines)
+            self.dirty = True
+
+    def getvalue(self):
+        with self._lock:
+            self.dirty = False
+            text = '\n'.join(self._lines)
+            if self._partial:
+                text = text + '\n' + self._partial if text else self._partial
+            return text
+
+
 @contextmanager
-def st_redirect(src, dst):
+def st_redirect(src, dst, max_lines=MAX_LINES, max_fps=MAX_FPS):
+    """
+    Show writes to a stream in a placeholder.
+
+    The last `max_lines` lines are kept. Writes from all threads of the
+    session are batched and rendered at most `max_fps` times per second by
+    one render thread, with a final render on exit.
+    """
     placeholder = st.empty()
     output_func = getattr(placeholder, dst)
+    buffer = _LineBuffer(max_lines)
+    stop = Event()
+    old_write = src.write
 
-    with StringIO() as buffer:
-        old_write = src.write
-
-        def new_write(b):
-            if getattr(current_thread(), SCRIPT_RUN_CONTEXT_ATTR_NAME, None):
-                buffer.write(b + '')
-                output_func(buffer.getvalue() + '')
-            else:
-                old_write(b)
-
-        try:
-            src.write = new_write
-            yield
-        finally:
-            src.write = old_write
+    def new_write(b):
+        if getattr(current_thread(), SCRIPT_RUN_CONTEXT_ATTR_NAME, None):
+            buffer.write(b + '')
+        else:
+            old_write(b)
+
+    def render():
+        if buffer.dirty:
+            output_func(buffer.getvalue())
+
+    def render_loop():
+        while not stop.wait(1 / max_fps):
+            render()
+
+    renderer = Thread(target=render_loop, daemon=True)
+    add_script_run_ctx(renderer, get_script_run_ctx())
+    try:
+        src.write = new_write
+        renderer.start()
+        yield
+    finally:
+        src.write = old_write
+        stop.set()
+        if renderer.is_alive():
+            renderer.join()
+        render()
 
 
 @contextmanager
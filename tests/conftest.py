@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Test Configuration Module
+"""
+# pylint: disable=C0103
+import sys as _sys
+from pathlib import Path as _Path
+
+ROOT = _Path(__file__).resolve().parent.parent
+BIN = ROOT / 'benchmarks' / 'bin'
+# Appended, so the repo's logging.py does not shadow the stdlib one.
+_sys.path.append(str(ROOT))
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Faucet Tests Module
+"""
+# pylint: disable=C0103,C0116,C0415
+import os as _os
+import subprocess as _subp
+import sys as _sys
+
+import pytest
+
+from conftest import BIN, ROOT
+
+_SEND = f"""
+import sys
+sys.path.append({str(ROOT)!r})
+sys.path.append({str(BIN)!r})
+from _fake import address, MPN_ADDRESS
+from Ziesha.Server import Faucet
+try:
+    print(Faucet(MPN_ADDRESS, 3600).send(address(1), 1))
+except Exception as e:
+    print(type(e).__name__)
+"""
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """Fake tools on PATH, an isolated home and a log of sent payouts."""
+    monkeypatch.setenv('PATH', f"{BIN}{_os.pathsep}{_os.environ['PATH']}")
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('FAKE_SEND_LOG', str(tmp_path / 'sent'))
+    monkeypatch.setenv('POOL_PUBLIC_IP', '127.0.0.1')
+    return tmp_path
+
+
+def _sent(env):
+    try:
+        return (env / 'sent').read_text().splitlines()
+    except FileNotFoundError:
+        return []
+
+
+def _send_in_processes(n, cwd):
+    # `-c` puts the working directory first on sys.path, where the repo's
+    # logging.py would shadow the stdlib one.
+    procs = [_subp.Popen([_sys.executable, '-c', _SEND], stdout=_subp.PIPE,
+                         text=True, cwd=cwd) for _ in range(n)]
+    return sorted(p.communicate(timeout=60)[0].strip() for p in procs)
+
+
+def test_processes_pay_an_address_once(env, monkeypatch):
+    monkeypatch.setenv('FAKE_LATENCY', '0.2')
+    out = _send_in_processes(8, env)
+    assert len(_sent(env)) == 1
+    assert out[:7] == ['FaucetDurationError'] * 7
+    assert out[7].startswith('Sent 1tℤ to ')
+
+
+@pytest.fixture
+def faucet(env):
+    from Ziesha.Core import _Multiton
+    from Ziesha.Server import Faucet
+    _sys.path.append(str(BIN))
+    from _fake import MPN_ADDRESS
+    yield Faucet(MPN_ADDRESS, 3600)
+    for k in [k for k in _Multiton._instances if k[0] is Faucet]:
+        del _Multiton._instances[k]
+
+
+def test_timeout_keeps_claim(env, faucet, monkeypatch):
+    from Ziesha import Core
+    from Ziesha.Exceptions import FaucetDurationError
+    from _fake import address
+    monkeypatch.setattr(Core._engine, 'timeout', 0.5)  # pylint: disable=W0212
+    monkeypatch.setenv('FAKE_BAZUKA_LATENCY', '2')
+    with pytest.raises(ValueError, match='may not have been sent'):
+        faucet.send(address(2), 1)
+    monkeypatch.setenv('FAKE_BAZUKA_LATENCY', '0')
+    with pytest.raises(FaucetDurationError):
+        faucet.send(address(2), 1)
+
+
+@pytest.mark.parametrize('response', ['', 'SomethingElse'])
+def test_unknown_response_keeps_claim(env, faucet, monkeypatch, response):
+    from Ziesha.Exceptions import FaucetDurationError
+    from _fake import address
+    monkeypatch.setenv('FAKE_SEND_RESPONSE', response)
+    with pytest.raises(ValueError, match='may not have been sent'):
+        faucet.send(address(3), 1)
+    with pytest.raises(FaucetDurationError):
+        faucet.send(address(3), 1)
+    assert len(_sent(env)) == 1
+
+
+def test_rejection_releases_claim(env, faucet, monkeypatch):
+    from _fake import address
+    monkeypatch.setenv('FAKE_SEND_RESPONSE', 'Error: insufficient balance')
+    monkeypatch.setenv('FAKE_SEND_EXIT', '1')
+    with pytest.raises(ValueError, match='insufficient balance'):
+        faucet.send(address(4), 1)
+    monkeypatch.setenv('FAKE_SEND_RESPONSE', 'PostMpnTransactionResponse')
+    monkeypatch.setenv('FAKE_SEND_EXIT', '0')
+    assert faucet.send(address(4), 1).startswith('Sent 1')
+    assert len(_sent(env)) == 2
+
+
+def test_faucet_per_wallet(env, faucet):
+    from Ziesha.Server import Faucet
+    from _fake import address
+    assert Faucet(faucet.wallet) is faucet
+    other = Faucet(address(5), 60)
+    assert other is not faucet and other.cool_down == 60
+    assert faucet.cool_down == 3600
+
+
+def test_faucets_keep_their_own_claims(env, faucet):
+    from Ziesha.Server import Faucet
+    from _fake import address
+    assert faucet.send(address(6), 1).startswith('Sent 1')
+    short = Faucet(address(7), 60)
+    with short._store._db as db:  # pylint: disable=W0212
+        db.execute("UPDATE claims SET claimed_at = claimed_at - 120")
+    short.load()
+    assert address(6) in faucet.hist
+    assert short.send(address(6), 1).startswith('Sent 1')
+
+
+def test_unknown_outcome_blocks_whole_cool_down(env, faucet, monkeypatch):
+    from Ziesha.Exceptions import FaucetDurationError
+    from _fake import address
+    monkeypatch.setenv('FAKE_SEND_RESPONSE', '')
+    with pytest.raises(ValueError, match='may not have been sent'):
+        faucet.send(address(8), 1)
+    with faucet._store._db as db:  # pylint: disable=W0212
+        db.execute("UPDATE claims SET claimed_at = claimed_at - 3000")
+    monkeypatch.setenv('FAKE_SEND_RESPONSE', 'PostMpnTransactionResponse')
+    with pytest.raises(FaucetDurationError):
+        faucet.submit(address(8), 1)
+    with pytest.raises(FaucetDurationError):
+        faucet.send(address(8), 1)
+    faucet._store.release(address(8))  # pylint: disable=W0212
+    assert faucet.send(address(8), 1).startswith('Sent 1')
+
+
+def test_store_without_wallets_is_migrated(tmp_path):
+    import sqlite3
+    from Ziesha.Store import FaucetStore
+    file = tmp_path / 'faucet.db'
+    with sqlite3.connect(file) as db:
+        db.execute("CREATE TABLE claims (address TEXT PRIMARY KEY, "
+                   "claimed_at REAL NOT NULL) WITHOUT ROWID")
+        db.execute("CREATE INDEX claims_claimed_at ON claims (claimed_at)")
+        db.execute("INSERT INTO claims VALUES ('za', 1e9)")
+    db.close()
+    store = FaucetStore(file, 'zw')
+    assert list(store.items()) == ['za']
+    assert list(FaucetStore(file, 'zother').items()) == []
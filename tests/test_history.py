@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+History Tests Module
+"""
+# pylint: disable=C0103,C0116,W0212
+import json as _json
+
+import pytest
+
+from Ziesha.History import PoolHistory
+
+
+def _line(token, t, shares=1, reward=0):
+    return _json.dumps({'token': token, 'timestamp': t, 'shares': shares,
+                        'reward': reward}) + '\n'
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    file = tmp_path / 'history'
+    file.write_text(_line('a', 0) + _line('b', 3600, reward=2))
+    return file
+
+
+def _history(file, **kwargs):
+    # A fresh instance instead of the shared one.
+    h = PoolHistory.__new__(PoolHistory)
+    h.__init__(file, **kwargs)
+    return h
+
+
+def test_append_keeps_unchanged_sorted_keys(history_file):
+    h = _history(history_file, save_interval=3600)
+    assert h.miner('a') == (1.0, 0.0)
+    assert h.miner('b') == (1.0, 2.0)
+    keys_b = h._keys['b']
+    with history_file.open('a') as f:
+        f.write(_line('a', 7200, shares=3))
+    assert h.miner('a') == (4.0, 0.0)
+    assert h._keys['b'] is keys_b
+    assert len(h.totals()) == 3
+
+
+def test_index_is_saved_later_and_at_flush(history_file):
+    h = _history(history_file, save_interval=3600)
+    assert h.update() == 2
+    assert not h._index_file.exists()
+    h.flush()
+    state = _json.loads(h._index_file.read_text())
+    assert state['offset'] == history_file.stat().st_size
+    h2 = _history(history_file)
+    assert h2.update() == 0
+    assert h2.miner('b') == (1.0, 2.0)
+
+
+def test_rewrite_in_place_rebuilds(history_file):
+    h = _history(history_file, save_interval=3600)
+    assert h.update() == 2
+    text = history_file.read_text().replace('"a"', '"c"')
+    with history_file.open('r+') as f:
+        f.write(text + _line('c', 0))
+    assert h.update() == 3
+    assert h.tokens == ['c', 'b']
+    assert h.miner('c') == (2.0, 0.0)
+
+
+def test_concurrent_appends_stay_in_windows(history_file):
+    import threading
+    h = _history(history_file, save_interval=3600)
+    stop = threading.Event()
+
+    def query():
+        while not stop.is_set():
+            h.totals()
+    readers = [threading.Thread(target=query) for _ in range(4)]
+    for t in readers:
+        t.start()
+    try:
+        for i in range(200):
+            with history_file.open('a') as f:
+                f.write(_line('a', 7200 * (i + 2)))
+            h.update()
+    finally:
+        stop.set()
+        for t in readers:
+            t.join()
+    assert len(h.totals()) == 202
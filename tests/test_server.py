@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Server Tests Module
+"""
+# pylint: disable=C0103,C0116
+import io as _io
+import json as _json
+
+import pytest
+
+from Ziesha.Server import _iter_json_array
+
+DOCS = ['[]', '[1.5, 2]', '[-0.25e+3,1e5 ,true,null]',
+        '[{"token": "a", "mpn_addr": {"pub_key": ["z1"]}}, "x,]", [1, [2]]]',
+        ' \n[ 10 , 200 , 3000 ]\n']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 65536])
+@pytest.mark.parametrize('doc', DOCS)
+def test_iter_json_array(doc, chunk_size):
+    items = list(_iter_json_array(_io.StringIO(doc), chunk_size))
+    assert items == _json.loads(doc)
+
+
+@pytest.mark.parametrize('doc', ['{"a": 1}', '[1, 2', '[1.5, tru]'])
+def test_iter_json_array_invalid(doc):
+    with pytest.raises(ValueError):
+        list(_iter_json_array(_io.StringIO(doc), 3))
+
+
+def _write_miners(file, wallets):
+    file.write_text(_json.dumps([
+        {'token': t, 'mpn_addr': {'pub_key': [w]}} for t, w in wallets.items()]))
+
+
+@pytest.fixture
+def pool_miners(tmp_path, monkeypatch):
+    from Ziesha.Core import _Singleton
+    from Ziesha.Server import PoolMiners
+    monkeypatch.setenv('HOME', str(tmp_path))
+    _Singleton._instances.pop(PoolMiners, None)
+    _write_miners(tmp_path / '.uzi-pool-miners', {'a': 'z1', 'b': 'z2'})
+    yield PoolMiners(stream_size=0)
+    _Singleton._instances.pop(PoolMiners, None)
+
+
+def test_pool_miners_reload_applies_diff(pool_miners, tmp_path):
+    old = pool_miners.miners
+    kept = old['a']
+    _write_miners(tmp_path / '.uzi-pool-miners', {'a': 'z1', 'b': 'z3', 'c': 'z4'})
+    added, removed = pool_miners.refresh()
+    assert (added, removed) == ({'c'}, set())
+    new = pool_miners.miners
+    assert new is not old and set(old) == {'a', 'b'}
+    assert new['a'] is kept
+    assert new['b'].wallet == 'z3' and new['c'].wallet == 'z4'
+    _write_miners(tmp_path / '.uzi-pool-miners', {'c': 'z4'})
+    assert pool_miners.refresh() == (set(), {'a', 'b'})
+    assert set(pool_miners.miners) == {'c'}
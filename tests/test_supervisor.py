@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Ziesha Pool.
+
+Supervisor Tests Module
+"""
+# pylint: disable=C0103,C0116,W0212
+import sys as _sys
+
+from Ziesha.Supervisor import MAX_LINE, Supervisor
+
+
+def _python(code):
+    return [_sys.executable, '-c', code]
+
+
+def test_long_lines_are_split():
+    sup = Supervisor(_python(
+        "import sys; sys.stdout.write('x' * 200000 + '\\nHeight: 7\\nend')"))
+    sup.start()
+    sup._thread.join(10)
+    assert sup.returncode == 0
+    lines = sup.lines
+    assert ''.join(lines[:-2]) == 'x' * 200000
+    assert max(len(line) for line in lines) <= MAX_LINE
+    assert lines[-2:] == ['Height: 7', 'end']
+    assert sup.state['height'] == 7
+
+
+def test_reader_failure_stops_process(monkeypatch):
+    sup = Supervisor(_python(
+        "import time\\nwhile True: print('tick', flush=True); time.sleep(0.01)"))
+
+    def fail(_raw):
+        raise RuntimeError('boom')
+    monkeypatch.setattr(sup, '_emit', fail)
+    sup.start()
+    sup._thread.join(10)
+    assert not sup._thread.is_alive()
+    assert sup.returncode is not None and sup.returncode != 0
+    assert 'boom' in sup.lines[-1]